@@ -36,15 +36,15 @@ def get_dependencies(
     from ..services.permission_service import filter_paths_by_grants
 
     service = DocumentService(db)
-    service.get_document_authorized(doc_id, auth.grants, "read")
+    service.get_document_authorized(doc_id, auth.compiled_grants, "read")
 
     dep_service = DependencyService(db)
     deps = dep_service.get_dependencies(doc_id)
 
     allowed_prefixes = filter_paths_by_grants(auth.grants)
     if "" not in allowed_prefixes:
-        deps.outgoing = [d for d in deps.outgoing if check_permission(auth.grants, _doc_path(db, d.to_doc_id), "read")]
-        deps.incoming = [d for d in deps.incoming if check_permission(auth.grants, _doc_path(db, d.from_doc_id), "read")]
+        deps.outgoing = [d for d in deps.outgoing if check_permission(auth.compiled_grants, _doc_path(db, d.to_doc_id), "read")]
+        deps.incoming = [d for d in deps.incoming if check_permission(auth.compiled_grants, _doc_path(db, d.from_doc_id), "read")]
 
     return deps
 
@@ -52,7 +52,7 @@ def _check_doc_access(service: DocumentService, auth: AuthContext, doc_id: str,
     Delegates to DocumentService.get_document_authorized() which hides
     permission logic in the service layer.
     """
-    return service.get_document_authorized(doc_id, auth.grants, action)
+    return service.get_document_authorized(doc_id, auth.compiled_grants, action)
 
 
 @router.post("", response_model=DocumentResponse, status_code=201)
@@ -63,7 +63,7 @@ def create_document(
     auth: AuthContext = Depends(require_auth),
 ):
     """Create or update a document (upsert)."""
-    if not check_permission(auth.grants, document.path, "edit"):
+    if not check_permission(auth.compiled_grants, document.path, "edit"):
         raise ForbiddenError("No edit access to this path")
 
     service = DocumentService(db)
@@ -168,7 +168,7 @@ def batch_operation(
         operation=batch.operation,
         doc_ids=batch.doc_ids,
         params=batch.params,
-        grants=auth.grants,
+        grants=auth.compiled_grants,
         is_service_account=auth.is_service_account,
     )
 
@@ -262,7 +262,7 @@ def batch_titles(
     for doc_id in doc_ids[:100]:
         doc = service.get_document(doc_id)
         if doc is not None:
-            if check_permission(auth.grants, doc.path, "read"):
+            if check_permission(auth.compiled_grants, doc.path, "read"):
                 result[doc_id] = doc.title
     return result
 
@@ -282,7 +282,7 @@ def resolve_wikilink(
     # Verify caller can see the resolved document
     service = DocumentService(db)
     doc = service.get_document(doc_id)
-    if doc is None or not check_permission(auth.grants, doc.path, "read"):
+    if doc is None or not check_permission(auth.compiled_grants, doc.path, "read"):
         raise HTTPException(status_code=404, detail=f"Could not resolve wikilink: {target}")
 
     return {"target": target, "doc_id": doc_id}
@@ -333,7 +333,7 @@ def move_document(
     service = DocumentService(db)
     _check_doc_access(service, auth, doc_id, "edit")
 
-    if not check_permission(auth.grants, request.target_path, "edit"):
+    if not check_permission(auth.compiled_grants, request.target_path, "edit"):
         raise ForbiddenError("No edit access to target path")
 
     try:
@@ -379,7 +379,7 @@ def delete_document(
     """Soft-delete a document (moves to trash). Idempotent — succeeds if already deleted."""
     service = DocumentService(db)
     doc = service.get_document(doc_id)
-    if doc is not None and not check_permission(auth.grants, doc.path, "delete"):
+    if doc is not None and not check_permission(auth.compiled_grants, doc.path, "delete"):
         raise DocumentNotFoundError(doc_id)
     # Idempotent: if doc is None (already deleted or never existed), still succeeds
     service.delete_document(doc_id)
@@ -398,7 +398,7 @@ def restore_document(
     doc = doc_repo.get_by_id_including_deleted(doc_id)
     if doc is None:
         raise DocumentNotFoundError(doc_id)
-    if not check_permission(auth.grants, doc.path or "", "delete"):
+    if not check_permission(auth.compiled_grants, doc.path or "", "delete"):
         raise DocumentNotFoundError(doc_id)  # 404 to avoid leaking existence
     service = DocumentService(db)
     return service.restore_document(doc_id)
@@ -466,5 +466,5 @@ def get_broken_links(
     doc_service = DocumentService(db)
     dep_service = DependencyService(db)
 
-    _check_doc_access(doc_service, auth, doc_id, "read")
-    return dep_service.get_broken_links(doc_id)
+    doc = _check_doc_access(doc_service, auth, doc_id, "read")
+    return dep_service.get_broken_links(doc_id, content=doc.content)
@@ -53,7 +53,7 @@ def create_folder_metadata(
     auth: AuthContext = Depends(require_auth),
 ):
     """Create metadata for a folder (idempotent at service level)."""
-    if not check_permission(auth.grants, data.path, "edit"):
+    if not check_permission(auth.compiled_grants, data.path, "edit"):
         raise ForbiddenError("No edit access to this path")
 
     service = FolderService(db)
@@ -76,7 +76,7 @@ def get_folder_metadata(
     if not folder:
         raise HTTPException(status_code=404, detail=f"Folder metadata not found: {folder_id}")
     folder_path = getattr(folder, "path", "")
-    if not check_permission(auth.grants, folder_path, "read"):
+    if not check_permission(auth.compiled_grants, folder_path, "read"):
         raise HTTPException(status_code=404, detail=f"Folder metadata not found: {folder_id}")
     return folder
 
@@ -105,7 +105,7 @@ def update_folder_metadata(
         raise HTTPException(status_code=404, detail=f"Folder metadata not found: {folder_id}")
 
     folder_path = getattr(folder, "path", "")
-    if not check_permission(auth.grants, folder_path, "edit"):
+    if not check_permission(auth.compiled_grants, folder_path, "edit"):
         raise ForbiddenError("No edit access to this folder")
 
     updated = service.update_folder(folder_id, data)
@@ -119,18 +119,22 @@ def update_folder_metadata(
 @router.put("/move", response_model=FolderOperationResponse)
 def move_folder(
     request: FolderMoveRequest,
+    include_tree: bool = True,
     db: Session = Depends(get_db),
     auth: AuthContext = Depends(require_auth),
 ):
-    """Move a folder to a new location. Requires edit on both source and target."""
-    if not check_permission(auth.grants, request.source_path, "edit"):
+    """Move a folder to a new location. Requires edit on both source and target.
+
+    Pass include_tree=false to skip rebuilding the tree in the response.
+    """
+    if not check_permission(auth.compiled_grants, request.source_path, "edit"):
         raise ForbiddenError("No edit access to source path")
-    if not check_permission(auth.grants, request.target_path, "edit"):
+    if not check_permission(auth.compiled_grants, request.target_path, "edit"):
         raise ForbiddenError("No edit access to target path")
 
     try:
         service = FolderService(db)
-        return service.move_folder(request.source_path, request.target_path)
+        return service.move_folder(request.source_path, request.target_path, include_tree)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -139,19 +143,23 @@ def move_folder(
 def delete_folder(
     folder_path: str,
     action: str = "move_up",
+    include_tree: bool = True,
     db: Session = Depends(get_db),
     auth: AuthContext = Depends(require_auth),
 ):
-    """Delete a folder. action='move_up' or 'delete_all'."""
+    """Delete a folder. action='move_up' or 'delete_all'.
+
+    Pass include_tree=false to skip rebuilding the tree in the response.
+    """
     if action not in ("move_up", "delete_all"):
         raise HTTPException(status_code=400, detail=f"Invalid action: {action}")
 
-    if not check_permission(auth.grants, folder_path, "delete"):
+    if not check_permission(auth.compiled_grants, folder_path, "delete"):
         raise ForbiddenError("No delete access to this folder")
 
     try:
         service = FolderService(db)
-        return service.delete_folder(folder_path, action)
+        return service.delete_folder(folder_path, action, include_tree)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
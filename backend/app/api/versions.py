@@ -22,7 +22,7 @@ def list_versions(
 ):
     """List all versions for a document."""
     service = DocumentService(db)
-    service.get_document_authorized(doc_id, auth.grants, "read")
+    service.get_document_authorized(doc_id, auth.compiled_grants, "read")
     return service.get_document_versions(doc_id, skip, limit)
 
 
@@ -34,7 +34,7 @@ def get_latest_version(
 ):
     """Get latest version for a document."""
     service = DocumentService(db)
-    service.get_document_authorized(doc_id, auth.grants, "read")
+    service.get_document_authorized(doc_id, auth.compiled_grants, "read")
     version = service.get_latest_version(doc_id)
     if not version:
         raise HTTPException(status_code=404, detail="No versions found")
@@ -50,7 +50,7 @@ def get_version(
 ):
     """Get specific version."""
     service = DocumentService(db)
-    service.get_document_authorized(doc_id, auth.grants, "read")
+    service.get_document_authorized(doc_id, auth.compiled_grants, "read")
     version = service.get_version(version_id)
     if not version:
         raise HTTPException(status_code=404, detail="Version not found")
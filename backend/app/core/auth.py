@@ -12,6 +12,7 @@ admin context with a root grant so the development workflow is unbroken.
 
 import logging
 from dataclasses import dataclass, field
+from functools import cached_property
 from datetime import datetime, timezone
 from typing import Optional, List
 
@@ -41,6 +42,17 @@ class AuthContext:
     role: str
     grants: list = field(default_factory=list)
 
+    @cached_property
+    def compiled_grants(self) -> dict[str, str]:
+        """Grants indexed for permission checks, built once per request.
+
+        Pass this to check_permission() instead of ``grants`` so a request
+        that checks several paths compiles the grant list only once.
+        """
+        from ..services.permission_service import compile_grants
+
+        return compile_grants(self.grants)
+
     @property
     def is_admin(self) -> bool:
         return self.role == "admin"
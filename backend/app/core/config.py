@@ -118,6 +118,10 @@ class Settings(BaseSettings):
         default=0,
         description="Embedding vector dimensions (0 = use model default)"
     )
+    embedding_parallelism: int = Field(
+        default=4,
+        description="Concurrent embedding API calls during re-indexing"
+    )
 
     # Chat / RAG Configuration
     # LiteLLM model string for RAG chat completions.
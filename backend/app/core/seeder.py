@@ -49,19 +49,16 @@ def seed_initial_documents(db: Session) -> int:
     if not documents:
         return 0
 
-    service = DocumentService(db)
-    seeded = 0
-
+    valid: list[DocumentCreate] = []
     for doc_data in documents:
         try:
-            doc_create = DocumentCreate(**doc_data)
-            service.create_or_update_document(doc_create, commit=False)
-            seeded += 1
+            valid.append(DocumentCreate(**doc_data))
         except (ValueError, KeyError, TypeError) as e:
             logger.warning("Invalid seed data for '%s': %s", doc_data.get("title", "?"), e)
 
+    seeded = len(valid)
     if seeded:
-        db.commit()
+        DocumentService(db).create_or_update_documents(valid)
         logger.info("Seeded %d documents from fixture", seeded)
 
         # Index seed documents for semantic search (no-op if embeddings not configured)
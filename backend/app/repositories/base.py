@@ -9,6 +9,7 @@ exclusion in DocumentRepository).
 """
 
 from typing import TypeVar, Generic, Optional, Type
+from sqlalchemy import case, func, or_
 from sqlalchemy.orm import Session, Query
 
 from ..database import Base
@@ -17,6 +18,34 @@ from ..exceptions import IsoException
 ModelT = TypeVar("ModelT", bound=Base)
 
 
+def path_prefix_filter(column, path: str):
+    """Match rows whose *column* is *path* or lies underneath it."""
+    return (column == path) | (column.like(f"{path}/%"))
+
+
+def path_grant_filter(column, prefixes: list[str]):
+    """Match rows whose *column* is at or under any of *prefixes*.
+
+    Exact matches collapse into one IN; each prefix adds one anchored LIKE,
+    served by the text_pattern_ops path index (migration 018).
+    """
+    return or_(column.in_(prefixes), *(column.like(f"{p}/%") for p in prefixes))
+
+
+def rewrite_path_prefix(column, source_path: str, target_path: str):
+    """SQL expression re-rooting *column* from *source_path* to *target_path*.
+
+    'src' becomes 'dst' and 'src/x/y' becomes 'dst/x/y'. An empty
+    *target_path* lifts descendants to the root ('src/x/y' -> 'x/y').
+    Pair with path_prefix_filter() so every row matched has the prefix.
+    """
+    remainder = func.substr(column, len(source_path) + 2)
+    return case(
+        (column == source_path, target_path),
+        else_=(target_path + "/" + remainder) if target_path else remainder,
+    )
+
+
 class BaseRepository(Generic[ModelT]):
     """Shared repository logic for SQLAlchemy models.
 
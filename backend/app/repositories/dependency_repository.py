@@ -1,9 +1,11 @@
 """Dependency repository for database operations."""
 
-from typing import List
+from typing import List, Optional
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from ..models import Dependency, Document
 from ..schemas.dependency import DependencyCreate, DocumentDependencies, DependencyResponse
-from .base import BaseRepository
+from .base import BaseRepository, path_grant_filter
 
 
 class DependencyRepository(BaseRepository[Dependency]):
@@ -25,6 +27,44 @@ class DependencyRepository(BaseRepository[Dependency]):
         self.db.refresh(db_dependency)
         return db_dependency
 
+    def create_if_absent(self, dependency: DependencyCreate) -> Optional[Dependency]:
+        """Create a dependency unless one already exists for the same pair.
+
+        Uses INSERT ... ON CONFLICT DO NOTHING against the
+        (from_doc_id, to_doc_id) unique index, so the duplicate check and
+        the write are one round-trip. Returns None on conflict.
+        """
+        stmt = (
+            pg_insert(Dependency)
+            .values(**dependency.model_dump())
+            .on_conflict_do_nothing(index_elements=["from_doc_id", "to_doc_id"])
+            .returning(Dependency)
+        )
+        return self.db.scalars(stmt).first()
+
+    def create_wikilinks(self, from_doc_id: str, links: dict[str, str]) -> int:
+        """Insert wikilink dependencies given {to_doc_id: link_text} in one multi-row INSERT.
+
+        Returns the count inserted. Pairs that already exist are skipped
+        (ON CONFLICT DO NOTHING on the (from_doc_id, to_doc_id) unique
+        index), so two concurrent saves of the same document cannot fail on
+        a duplicate. Rows are plain mappings: no ORM objects or schema
+        validation per link.
+        """
+        if not links:
+            return 0
+        rows = [
+            {"from_doc_id": from_doc_id, "to_doc_id": to_doc_id,
+             "link_type": "wikilink", "link_text": link_text}
+            for to_doc_id, link_text in links.items()
+        ]
+        stmt = (
+            pg_insert(Dependency)
+            .values(rows)
+            .on_conflict_do_nothing(index_elements=["from_doc_id", "to_doc_id"])
+        )
+        return self.db.execute(stmt).rowcount
+
     def get_by_document(self, doc_id: str) -> DocumentDependencies:
         """Get all dependencies for a document (incoming and outgoing)."""
         outgoing = self.db.query(Dependency).filter(Dependency.from_doc_id == doc_id).all()
@@ -43,20 +83,12 @@ class DependencyRepository(BaseRepository[Dependency]):
         both endpoints are under an accessible path — filtering in SQL instead
         of loading all documents into Python.
         """
-        from sqlalchemy import or_
-
         active_filter = Document.deleted_at.is_(None)
 
         if allowed_prefixes is not None and "" not in allowed_prefixes:
             if not allowed_prefixes:
                 return []
-            # Build path-prefix clauses once, reuse for both subqueries
-            path_clauses = []
-            for prefix in allowed_prefixes:
-                path_clauses.append(Document.path == prefix)
-                path_clauses.append(Document.path.like(f"{prefix}/%"))
-            grant_filter = or_(*path_clauses)
-
+            grant_filter = path_grant_filter(Document.path, allowed_prefixes)
             accessible_ids = (
                 self.db.query(Document.id)
                 .filter(active_filter, grant_filter)
@@ -80,6 +112,57 @@ class DependencyRepository(BaseRepository[Dependency]):
         """Get all outgoing dependencies from a document."""
         return self.db.query(Dependency).filter(Dependency.from_doc_id == doc_id).all()
 
+    def get_pair(self, from_doc_id: str, to_doc_id: str) -> Optional[Dependency]:
+        """Get the dependency between two documents (unique index lookup)."""
+        return self.db.query(Dependency).filter(
+            Dependency.from_doc_id == from_doc_id,
+            Dependency.to_doc_id == to_doc_id,
+        ).first()
+
+    def get_outgoing_links(self, doc_id: str) -> list[tuple[int, str, str, Optional[str]]]:
+        """Get (id, to_doc_id, link_type, link_text) for a document's outgoing dependencies."""
+        return self.db.query(
+            Dependency.id, Dependency.to_doc_id, Dependency.link_type, Dependency.link_text
+        ).filter(Dependency.from_doc_id == doc_id).all()
+
+    def has_outgoing(self, doc_id: str) -> bool:
+        """Whether a document has any outgoing dependency (indexed EXISTS query)."""
+        return self.db.query(
+            self.db.query(Dependency.id).filter(Dependency.from_doc_id == doc_id).exists()
+        ).scalar()
+
+    def has_path(self, start: str, target: str) -> bool:
+        """Whether target is reachable from start by following dependencies.
+
+        Walks the graph inside the database with a recursive CTE, so the
+        traversal is a single round-trip regardless of depth. UNION (not
+        UNION ALL) deduplicates visited nodes, which also terminates cycles.
+        """
+        row = self.db.execute(
+            text("""
+                WITH RECURSIVE reachable(doc_id) AS (
+                    SELECT CAST(:start AS VARCHAR)
+                    UNION
+                    SELECT d.to_doc_id
+                    FROM dependencies d
+                    JOIN reachable r ON d.from_doc_id = r.doc_id
+                )
+                SELECT 1 FROM reachable WHERE doc_id = :target LIMIT 1
+            """),
+            {"start": start, "target": target},
+        ).first()
+        return row is not None
+
+    def update_link_text(self, from_doc_ids: List[str], to_doc_id: str, old_text: str, new_text: str) -> int:
+        """Rename the link text of edges from *from_doc_ids* to *to_doc_id* in one UPDATE."""
+        if not from_doc_ids:
+            return 0
+        return self.db.query(Dependency).filter(
+            Dependency.from_doc_id.in_(from_doc_ids),
+            Dependency.to_doc_id == to_doc_id,
+            Dependency.link_text == old_text,
+        ).update({Dependency.link_text: new_text}, synchronize_session=False)
+
     def delete(self, dependency_id: int) -> bool:
         """Delete a specific dependency by ID."""
         dependency = self.db.query(Dependency).filter(Dependency.id == dependency_id).first()
@@ -88,6 +171,14 @@ class DependencyRepository(BaseRepository[Dependency]):
             return True
         return False
 
+    def delete_by_ids(self, dependency_ids: List[int]) -> int:
+        """Delete several dependencies by ID in one statement."""
+        if not dependency_ids:
+            return 0
+        return self.db.query(Dependency).filter(
+            Dependency.id.in_(dependency_ids)
+        ).delete(synchronize_session=False)
+
     def delete_by_document(self, doc_id: str) -> int:
         """Delete all dependencies for a document (both directions)."""
         count = self.db.query(Dependency).filter(
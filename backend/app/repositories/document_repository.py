@@ -8,14 +8,14 @@ so callers never need to think about the deleted_at column.
 import re
 
 from sqlalchemy.orm import Query
-from sqlalchemy import text, or_
+from sqlalchemy import Row, func, select, text, update
 import sqlalchemy.exc
 from typing import List, Optional
 from datetime import datetime, timedelta, timezone
 from ..models import Document
 from ..schemas.document import DocumentCreate, DocumentUpdate, SearchResultResponse, SimilarDocumentResponse
 from ..exceptions import DocumentNotFoundError
-from .base import BaseRepository
+from .base import BaseRepository, path_grant_filter, path_prefix_filter, rewrite_path_prefix
 
 # Maximum length of content preview stored alongside each document.
 # 500 chars ≈ 3-4 sentences, enough for meaningful list-view previews
@@ -61,11 +61,7 @@ class DocumentRepository(BaseRepository[Document]):
         if "" in allowed_prefixes:
             return text("1=1")
 
-        clauses = []
-        for prefix in allowed_prefixes:
-            clauses.append(Document.path == prefix)
-            clauses.append(Document.path.like(f"{prefix}/%"))
-        return or_(*clauses)
+        return path_grant_filter(Document.path, allowed_prefixes)
 
     def create(self, doc_id: str, document: DocumentCreate) -> Document:
         """Create a new document."""
@@ -92,6 +88,52 @@ class DocumentRepository(BaseRepository[Document]):
     # get_by_id and get_by_id_optional are inherited from BaseRepository
     # and use _base_query(), so they automatically exclude soft-deleted docs.
 
+    def get_by_ids(self, doc_ids: list[str]) -> List[Document]:
+        """Get active documents by ID in a single query. Missing IDs are skipped."""
+        if not doc_ids:
+            return []
+        return self._base_query().filter(Document.id.in_(doc_ids)).all()
+
+    def get_content(self, doc_id: str) -> Optional[str]:
+        """Get only an active document's content, without hydrating the ORM row."""
+        return self._base_query().with_entities(Document.content).filter(Document.id == doc_id).scalar()
+
+    def get_description(self, doc_id: str) -> Optional[str]:
+        """Get only an active document's description (None if missing or unset)."""
+        return self._base_query().with_entities(Document.description).filter(Document.id == doc_id).scalar()
+
+    def get_existing_ids(self, doc_ids: list[str]) -> set[str]:
+        """Return which of the given IDs belong to active documents (one query)."""
+        if not doc_ids:
+            return set()
+        rows = self._base_query().with_entities(Document.id).filter(Document.id.in_(doc_ids)).all()
+        return {row.id for row in rows}
+
+    def get_paths(self, doc_ids: list[str]) -> dict[str, str]:
+        """Map each active document ID to its path (one id/path-only query)."""
+        if not doc_ids:
+            return {}
+        rows = self._base_query().with_entities(Document.id, Document.path).filter(
+            Document.id.in_(doc_ids)
+        ).all()
+        return {row.id: row.path for row in rows}
+
+    def get_keywords_many(self, doc_ids: list[str]) -> dict[str, list]:
+        """Map each active document ID to its keywords (one id/keywords-only query)."""
+        if not doc_ids:
+            return {}
+        rows = self._base_query().with_entities(Document.id, Document.keywords).filter(
+            Document.id.in_(doc_ids)
+        ).all()
+        return {row.id: row.keywords or [] for row in rows}
+
+    def update_keywords_many(self, keywords_by_id: dict[str, list]) -> None:
+        """Set keywords on several documents in one executemany UPDATE by primary key."""
+        if keywords_by_id:
+            self.db.bulk_update_mappings(
+                Document, [{"id": doc_id, "keywords": kws} for doc_id, kws in keywords_by_id.items()]
+            )
+
     def get_by_id_including_deleted(self, doc_id: str) -> Optional[Document]:
         """Get document by ID regardless of soft-delete status."""
         return self.db.query(Document).filter(Document.id == doc_id).first()
@@ -129,6 +171,23 @@ class DocumentRepository(BaseRepository[Document]):
             query = query.filter(self._grant_filter(allowed_prefixes))
         return query.offset(skip).limit(limit).all()
 
+    def get_all_for_tree(
+        self,
+        limit: int,
+        allowed_prefixes: Optional[list[str]] = None,
+    ) -> list[Row]:
+        """Active documents as (id, title, path, repo_name, doc_type) rows.
+
+        Only the columns the navigation tree renders are selected, so
+        content and embeddings are neither transferred nor hydrated.
+        """
+        query = self._base_query().with_entities(
+            Document.id, Document.title, Document.path, Document.repo_name, Document.doc_type
+        )
+        if allowed_prefixes is not None:
+            query = query.filter(self._grant_filter(allowed_prefixes))
+        return query.limit(limit).all()
+
     def get_tracked_repo_urls(self) -> List[str]:
         """Get distinct repo_url values from active documents."""
         rows = (
@@ -228,6 +287,23 @@ class DocumentRepository(BaseRepository[Document]):
             db_document.deleted_at = datetime.now(timezone.utc)
         return True
 
+    def soft_delete_many(self, doc_ids: list[str]) -> set[str]:
+        """Mark several documents as deleted in one UPDATE. Returns the IDs that exist.
+
+        Idempotent like soft_delete(): documents already in the trash keep
+        their original deleted_at and are still reported as found.
+        """
+        if not doc_ids:
+            return set()
+        stmt = (
+            update(Document)
+            .where(Document.id.in_(doc_ids))
+            .values(deleted_at=func.coalesce(Document.deleted_at, datetime.now(timezone.utc)))
+            .returning(Document.id)
+            .execution_options(synchronize_session=False)
+        )
+        return set(self.db.scalars(stmt).all())
+
     def restore(self, doc_id: str) -> Document:
         """Restore a soft-deleted document. Raises DocumentNotFoundError. Idempotent if not deleted."""
         db_document = self.db.query(Document).filter(Document.id == doc_id).first()
@@ -259,16 +335,24 @@ class DocumentRepository(BaseRepository[Document]):
             query = query.filter(self._grant_filter(allowed_prefixes))
         return query.order_by(Document.deleted_at.desc()).offset(skip).limit(limit).all()
 
-    def purge_expired(self, days: int = 30) -> int:
-        """Permanently delete documents that have been in trash longer than `days`."""
+    def purge_expired(self, days: int = 30, limit: Optional[int] = None) -> int:
+        """Permanently delete documents that have been in trash longer than `days`.
+
+        With *limit*, deletes at most that many per call so callers can purge
+        a large trash in bounded chunks. Returns the count deleted.
+        """
         cutoff = datetime.now(timezone.utc) - timedelta(days=days)
-        count = (
+        expired = select(Document.id).where(
+            Document.deleted_at.isnot(None),
+            Document.deleted_at < cutoff,
+        )
+        if limit is not None:
+            expired = expired.limit(limit)
+        return (
             self.db.query(Document)
-            .filter(Document.deleted_at.isnot(None))
-            .filter(Document.deleted_at < cutoff)
-            .delete(synchronize_session="fetch")
+            .filter(Document.id.in_(expired))
+            .delete(synchronize_session=False)
         )
-        return count
 
     def search(self, query: str, limit: int = 20, allowed_prefixes: Optional[list[str]] = None) -> List[Document]:
         """Simple ILIKE search fallback (excludes soft-deleted)."""
@@ -346,12 +430,11 @@ class DocumentRepository(BaseRepository[Document]):
             if allowed_prefixes is not None and "" not in allowed_prefixes:
                 if not allowed_prefixes:
                     return []
-                grant_clauses = []
-                for i, prefix in enumerate(allowed_prefixes):
-                    grant_clauses.append(f"(d.path = :gp_exact_{i} OR d.path LIKE :gp_like_{i})")
-                    params[f"gp_exact_{i}"] = prefix
-                    params[f"gp_like_{i}"] = f"{prefix}/%"
-                sql += f" AND ({' OR '.join(grant_clauses)})"
+                # One array-valued predicate regardless of grant count; the
+                # tsvector match drives this query, the grant test is a recheck.
+                sql += " AND (d.path = ANY(:grant_paths) OR d.path LIKE ANY(:grant_likes))"
+                params["grant_paths"] = list(allowed_prefixes)
+                params["grant_likes"] = [f"{prefix}/%" for prefix in allowed_prefixes]
 
             if date_from:
                 sql += " AND d.updated_at >= :date_from"
@@ -458,6 +541,28 @@ class DocumentRepository(BaseRepository[Document]):
         )
         self.db.flush()
 
+    def update_embeddings_many(self, embeddings: dict[str, list[float]], model_name: str) -> None:
+        """Store embeddings for several documents in a single UPDATE ... FROM (VALUES ...)."""
+        if not embeddings:
+            return
+        params: dict = {"model": model_name}
+        values = []
+        for i, (doc_id, embedding) in enumerate(embeddings.items()):
+            values.append(f"(:id_{i}, :embedding_{i})")
+            params[f"id_{i}"] = doc_id
+            params[f"embedding_{i}"] = str(embedding)
+        self.db.execute(
+            text(f"""
+                UPDATE documents AS d
+                SET description_embedding = CAST(v.embedding AS vector),
+                    embedding_model = :model
+                FROM (VALUES {", ".join(values)}) AS v(id, embedding)
+                WHERE d.id = v.id
+            """),
+            params,
+        )
+        self.db.flush()
+
     def search_by_vector(
         self,
         query_embedding: list[float],
@@ -519,17 +624,13 @@ class DocumentRepository(BaseRepository[Document]):
         )
 
     def move_folder(self, source_path: str, target_path: str) -> int:
-        """Move folder by updating path prefixes (active docs only)."""
-        affected_docs = self._base_query().filter(
-            (Document.path == source_path) |
-            (Document.path.like(f"{source_path}/%"))
-        ).all()
-
-        for doc in affected_docs:
-            if doc.path == source_path:
-                doc.path = target_path
-            else:
-                relative_path = doc.path[len(source_path) + 1:]
-                doc.path = f"{target_path}/{relative_path}"
+        """Move folder by updating path prefixes (active docs only, one UPDATE).
 
-        return len(affected_docs)
+        An empty *target_path* moves the folder's contents up to the root.
+        """
+        return self._base_query().filter(
+            path_prefix_filter(Document.path, source_path)
+        ).update(
+            {Document.path: rewrite_path_prefix(Document.path, source_path, target_path)},
+            synchronize_session="fetch",
+        )
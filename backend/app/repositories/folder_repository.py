@@ -1,10 +1,12 @@
 """Repository for folder metadata database operations."""
 
-from typing import List, Optional
+from typing import List, Optional, Tuple
+from sqlalchemy import Row, exists, func
+from ..models import Document
 from ..models.folder_metadata import FolderMetadata
 from ..schemas.folder import FolderMetadataCreate, FolderMetadataUpdate
 from ..exceptions import FolderNotFoundError
-from .base import BaseRepository
+from .base import BaseRepository, path_prefix_filter, rewrite_path_prefix
 
 
 class FolderMetadataRepository(BaseRepository[FolderMetadata]):
@@ -29,6 +31,19 @@ class FolderMetadataRepository(BaseRepository[FolderMetadata]):
         self.db.refresh(folder)
         return folder
 
+    def create_many(self, folders: List[Tuple[str, str]]) -> None:
+        """Create default metadata for several (folder_id, path) pairs with one flush."""
+        if folders:
+            self.db.add_all([FolderMetadata(id=fid, path=path) for fid, path in folders])
+            self.db.flush()
+
+    def get_existing_ids(self, folder_ids: List[str]) -> set[str]:
+        """Return which of the given folder IDs already exist (one query)."""
+        if not folder_ids:
+            return set()
+        rows = self.db.query(FolderMetadata.id).filter(FolderMetadata.id.in_(folder_ids)).all()
+        return {row.id for row in rows}
+
     def get_by_path(self, path: str) -> Optional[FolderMetadata]:
         """Get folder metadata by full path."""
         return self.db.query(FolderMetadata).filter(FolderMetadata.path == path).first()
@@ -40,6 +55,12 @@ class FolderMetadataRepository(BaseRepository[FolderMetadata]):
             FolderMetadata.path
         ).all()
 
+    def get_all_for_tree(self) -> List[Row]:
+        """All folder metadata as (path, description, icon) rows."""
+        return self.db.query(
+            FolderMetadata.path, FolderMetadata.description, FolderMetadata.icon
+        ).all()
+
     def update(self, folder_id: str, data: FolderMetadataUpdate) -> FolderMetadata:
         """Update folder metadata. Raises FolderNotFoundError."""
         folder = self.get_by_id(folder_id)
@@ -60,14 +81,26 @@ class FolderMetadataRepository(BaseRepository[FolderMetadata]):
         self.db.delete(folder)
         return True
 
-    def cleanup_orphans(self, existing_paths: set) -> int:
-        """Remove folder metadata for paths that no longer exist."""
-        orphans = self.db.query(FolderMetadata).filter(
-            FolderMetadata.path.notin_(existing_paths)
-        ).all()
+    def move_prefix(self, source_path: str, target_path: str) -> int:
+        """Re-path metadata at or under *source_path* to *target_path* (one UPDATE)."""
+        return self.db.query(FolderMetadata).filter(
+            path_prefix_filter(FolderMetadata.path, source_path)
+        ).update(
+            {FolderMetadata.path: rewrite_path_prefix(FolderMetadata.path, source_path, target_path)},
+            synchronize_session="fetch",
+        )
 
-        count = len(orphans)
-        for orphan in orphans:
-            self.db.delete(orphan)
+    def cleanup_orphans(self) -> int:
+        """Remove folder metadata with no active document at or under its path.
 
-        return count
+        A single DELETE ... WHERE NOT EXISTS; nothing is loaded into Python.
+        """
+        fm_path = FolderMetadata.path
+        has_documents = exists().where(
+            Document.deleted_at.is_(None),
+            (Document.path == fm_path)
+            | (func.substr(Document.path, 1, func.length(fm_path) + 1) == fm_path + "/"),
+        )
+        return self.db.query(FolderMetadata).filter(~has_documents).delete(
+            synchronize_session="fetch"
+        )
@@ -3,7 +3,9 @@
 import hashlib
 from datetime import datetime
 from typing import List, Optional
+from sqlalchemy import Row, String, cast, literal_column, null, select, union_all
 from sqlalchemy.orm import Session
+from ..models import Document
 from ..models.personal import PersonalFolder, PersonalDocumentRef
 
 
@@ -40,6 +42,45 @@ class PersonalTreeRepository:
             .all()
         )
 
+    def load_tree_rows(self, user_id: str) -> List[Row]:
+        """Every folder and document ref of a user in one UNION ALL query.
+
+        Rows are (kind, id, parent_id, name, document_id, title): kind 'f'
+        rows are folders (parent_id is the parent folder), kind 'r' rows are
+        refs (parent_id is the containing folder, title is the referenced
+        document's title, NULL if it is missing or soft-deleted). Folders
+        come first, each kind in its display order.
+        """
+        folders = select(
+            literal_column("'f'").label("kind"),
+            PersonalFolder.folder_id.label("id"),
+            PersonalFolder.parent_id.label("parent_id"),
+            PersonalFolder.name.label("name"),
+            cast(null(), String).label("document_id"),
+            cast(null(), String).label("title"),
+            PersonalFolder.sort_order.label("sort_order"),
+        ).where(PersonalFolder.user_id == user_id)
+        refs = (
+            select(
+                literal_column("'r'"),
+                PersonalDocumentRef.ref_id,
+                PersonalDocumentRef.folder_id,
+                cast(null(), String),
+                PersonalDocumentRef.document_id,
+                Document.title,
+                PersonalDocumentRef.sort_order,
+            )
+            .outerjoin(
+                Document,
+                (Document.id == PersonalDocumentRef.document_id) & Document.deleted_at.is_(None),
+            )
+            .where(PersonalDocumentRef.user_id == user_id)
+        )
+        tree = union_all(folders, refs).subquery()
+        return self.db.execute(
+            select(tree).order_by(tree.c.kind, tree.c.sort_order, tree.c.name)
+        ).all()
+
     def get_children(self, folder_id: str) -> List[PersonalFolder]:
         return (
             self.db.query(PersonalFolder)
@@ -48,6 +89,26 @@ class PersonalTreeRepository:
             .all()
         )
 
+    def is_descendant(self, ancestor_id: str, candidate_id: str) -> bool:
+        """True if *candidate_id* lies anywhere below *ancestor_id*.
+
+        Walks the subtree with one recursive CTE. UNION (not UNION ALL)
+        keeps the walk finite even if the parent links ever form a cycle.
+        """
+        subtree = (
+            select(PersonalFolder.folder_id)
+            .where(PersonalFolder.parent_id == ancestor_id)
+            .cte("subtree", recursive=True)
+        )
+        subtree = subtree.union(
+            select(PersonalFolder.folder_id).join(
+                subtree, PersonalFolder.parent_id == subtree.c.folder_id
+            )
+        )
+        return self.db.query(
+            select(subtree.c.folder_id).where(subtree.c.folder_id == candidate_id).exists()
+        ).scalar()
+
     def move_folder(self, folder_id: str, new_parent_id: Optional[str]) -> Optional[PersonalFolder]:
         folder = self.get_folder(folder_id)
         if not folder:
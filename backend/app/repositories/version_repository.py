@@ -16,8 +16,9 @@ class VersionRepository(BaseRepository[Version]):
     id_column = "version_id"
     not_found_error = VersionNotFoundError
 
-    def create(self, version: VersionCreate) -> Version:
-        """Create a new version."""
+    @staticmethod
+    def _build(version: VersionCreate) -> Version:
+        """Build an unsaved Version row with its generated ID and content hash."""
         # Generate version ID: {doc_id}-{timestamp}
         timestamp = datetime.now(timezone.utc).isoformat().replace(':', '-').replace('.', '-')
         version_id = f"{version.doc_id}-{timestamp}"
@@ -25,7 +26,7 @@ class VersionRepository(BaseRepository[Version]):
         # Calculate content hash (SHA256)
         content_hash = hashlib.sha256(version.content.encode()).hexdigest()
 
-        db_version = Version(
+        return Version(
             version_id=version_id,
             doc_id=version.doc_id,
             content=version.content,
@@ -33,11 +34,28 @@ class VersionRepository(BaseRepository[Version]):
             author_type=version.author_type,
             author_metadata=version.author_metadata
         )
+
+    def create(self, version: VersionCreate) -> Version:
+        """Create a new version."""
+        db_version = self._build(version)
         self.db.add(db_version)
         self.db.flush()
         self.db.refresh(db_version)
         return db_version
 
+    def create_many(self, versions: List[VersionCreate]) -> List[Version]:
+        """Create versions for several documents with a single flush.
+
+        Each entry must target a different document (version IDs are
+        {doc_id}-{timestamp}). Rows are not refreshed; server defaults such
+        as created_at load lazily on first access.
+        """
+        db_versions = [self._build(v) for v in versions]
+        if db_versions:
+            self.db.add_all(db_versions)
+            self.db.flush()
+        return db_versions
+
     # get_by_id and get_by_id_optional are inherited from BaseRepository
     # with id_column="version_id".
 
@@ -52,3 +70,16 @@ class VersionRepository(BaseRepository[Version]):
         return self.db.query(Version).filter(
             Version.doc_id == doc_id
         ).order_by(Version.created_at.desc()).first()
+
+    def get_latest_author_types(self, doc_ids: list[str]) -> dict[str, str]:
+        """Map each document ID to the author_type of its latest version (one query).
+
+        Uses PostgreSQL DISTINCT ON to pick the newest version per document.
+        Documents without versions are absent from the result.
+        """
+        if not doc_ids:
+            return {}
+        rows = self.db.query(Version.doc_id, Version.author_type).filter(
+            Version.doc_id.in_(doc_ids)
+        ).distinct(Version.doc_id).order_by(Version.doc_id, Version.created_at.desc()).all()
+        return {doc_id: author_type for doc_id, author_type in rows}
@@ -6,7 +6,9 @@ the context to an LLM via LiteLLM for answer generation.
 
 import logging
 import re
+import sys
 
+import litellm
 from sqlalchemy.orm import Session
 
 from ..core.config import settings
@@ -17,20 +19,22 @@ from .embedding_service import EmbeddingService
 logger = logging.getLogger(__name__)
 
 # Common stop words to strip from natural language questions for FTS
-_STOP_WORDS = frozenset(
+_STOP_WORDS = frozenset(sys.intern(w) for w in (
     "a an the is are was were be been being have has had do does did "
     "will would shall should may might can could this that these those "
     "i me my we our you your he him his she her it its they them their "
     "what which who whom how where when why and or not no nor but if "
     "then so than too very just about above after again all also any "
     "because before between both by down during each for from in into "
-    "of on once only other out over own same some such up with".split()
-)
+    "of on once only other out over own same some such up with"
+).split())
+
+_PUNCTUATION_RE = re.compile(r'[^\w\s]')
 
 
 def _extract_search_terms(question: str) -> list[str]:
     """Extract meaningful keywords from a natural language question for FTS."""
-    words = re.sub(r'[^\w\s]', '', question.lower()).split()
+    words = _PUNCTUATION_RE.sub('', question.lower()).split()
     return [w for w in words if w not in _STOP_WORDS and len(w) > 2][:4]
 
 
@@ -50,6 +54,16 @@ class ChatService:
         self.db = db
         self.doc_repo = DocumentRepository(db)
         self.embedding_svc = EmbeddingService(db)
+        # Request-independent completion kwargs; ask() only adds messages.
+        self._base_kwargs: dict = {
+            "model": settings.chat_model,
+            "api_key": settings.chat_api_key or settings.embedding_api_key,
+            "max_tokens": 1024,
+            "temperature": 0.3,
+            "timeout": 30,
+        }
+        if settings.chat_api_base:
+            self._base_kwargs["api_base"] = settings.chat_api_base
 
     @staticmethod
     def is_configured() -> bool:
@@ -141,14 +155,12 @@ class ChatService:
             )
 
         # --- Build context ---
-        context_parts = []
-        for i, doc in enumerate(context_docs, 1):
-            context_parts.append(
-                f"--- Document {i}: {doc['title']} ---\n"
-                f"Path: {doc['path']}\n"
-                f"{doc['content']}\n"
-            )
-        context_text = "\n".join(context_parts)
+        context_text = "\n".join(
+            f"--- Document {i}: {doc['title']} ---\n"
+            f"Path: {doc['path']}\n"
+            f"{doc['content']}\n"
+            for i, doc in enumerate(context_docs, 1)
+        )
 
         # --- LLM call ---
         messages = [
@@ -163,20 +175,7 @@ class ChatService:
         ]
 
         try:
-            import litellm
-
-            chat_kwargs: dict = {
-                "model": settings.chat_model,
-                "api_key": settings.chat_api_key or settings.embedding_api_key,
-                "messages": messages,
-                "max_tokens": 1024,
-                "temperature": 0.3,
-                "timeout": 30,
-            }
-            if settings.chat_api_base:
-                chat_kwargs["api_base"] = settings.chat_api_base
-
-            response = litellm.completion(**chat_kwargs)
+            response = litellm.completion(messages=messages, **self._base_kwargs)
             answer = response.choices[0].message.content
         except Exception as e:
             logger.exception("Chat completion failed")
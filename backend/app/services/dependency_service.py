@@ -11,15 +11,19 @@ Hides all validation complexity:
 import re
 import logging
 from sqlalchemy.orm import Session
-from typing import List, Optional, Set
+from typing import Iterable, List, Optional, Set
 from ..repositories.dependency_repository import DependencyRepository
 from ..repositories.document_repository import DocumentRepository
 from ..schemas.dependency import DependencyCreate, DependencyResponse, DocumentDependencies, BrokenLinkInfo
 from ..models import Dependency
-from ..exceptions import DocumentNotFoundError, CircularDependencyError, SelfDependencyError, ValidationError
+from ..exceptions import CircularDependencyError, DocumentNotFoundError, SelfDependencyError, ValidationError
 
 logger = logging.getLogger(__name__)
 
+# [[Target]] or [[Target|display text]]; group 1 is the Target part only.
+# The lookahead skips external URL targets ([[https://...]]) in the same pass.
+_WIKILINK_RE = re.compile(r'\[\[(?!\s*(?:https?|ftp)://)([^\]|]+)(?:\|[^\]]*)?\]\]')
+
 
 class DependencyService:
     """
@@ -34,6 +38,14 @@ class DependencyService:
         self.db = db
         self.dep_repo = DependencyRepository(db)
         self.doc_repo = DocumentRepository(db)
+        # Wikilink target -> doc ID (None = unresolved), memoized for the
+        # lifetime of this service. Cleared whenever titles or repo names
+        # may have changed.
+        self._resolve_cache: dict[str, Optional[str]] = {}
+
+    def clear_resolve_cache(self) -> None:
+        """Forget memoized wikilink resolutions (call after document create/move/delete)."""
+        self._resolve_cache.clear()
 
     def create_dependency(self, dependency: DependencyCreate) -> Dependency:
         """
@@ -57,11 +69,12 @@ class DependencyService:
         Raises:
             ValueError: If validation fails
         """
-        # Validate source document exists (raises DocumentNotFoundError)
-        source_doc = self.doc_repo.get_by_id(dependency.from_doc_id)
-
-        # Validate target document exists (raises DocumentNotFoundError)
-        target_doc = self.doc_repo.get_by_id(dependency.to_doc_id)
+        # Validate both documents exist in one query. Soft-deleted documents
+        # still satisfy the foreign keys, so this can't be left to the INSERT.
+        existing = self.doc_repo.get_existing_ids([dependency.from_doc_id, dependency.to_doc_id])
+        for doc_id in (dependency.from_doc_id, dependency.to_doc_id):
+            if doc_id not in existing:
+                raise DocumentNotFoundError(doc_id)
 
         # Validate no self-links
         if dependency.from_doc_id == dependency.to_doc_id:
@@ -72,13 +85,12 @@ class DependencyService:
         if dependency.link_type != "wikilink" and self._would_create_cycle(dependency.from_doc_id, dependency.to_doc_id):
             raise CircularDependencyError(dependency.from_doc_id, dependency.to_doc_id)
 
-        # Check for existing dependency (idempotent)
-        existing = self._find_existing(dependency.from_doc_id, dependency.to_doc_id)
-        if existing:
-            return existing
-
-        # All validations passed - create dependency
-        return self.dep_repo.create(dependency)
+        # All validations passed - create dependency, or return the existing
+        # one for this pair (idempotent; duplicate check happens in the INSERT)
+        created = self.dep_repo.create_if_absent(dependency)
+        if created is not None:
+            return created
+        return self._find_existing(dependency.from_doc_id, dependency.to_doc_id)
 
     def get_dependencies(self, doc_id: str) -> DocumentDependencies:
         """
@@ -112,18 +124,15 @@ class DependencyService:
 
         Internal helper for idempotent create operations.
         """
-        outgoing = self.dep_repo.get_by_source(from_doc_id)
-        for dep in outgoing:
-            if dep.to_doc_id == to_doc_id:
-                return dep
-        return None
+        return self.dep_repo.get_pair(from_doc_id, to_doc_id)
 
     def _would_create_cycle(self, from_doc_id: str, to_doc_id: str) -> bool:
         """
         Check if adding this dependency would create a circular reference.
 
-        Uses depth-first search to detect if there's already a path from
-        to_doc_id back to from_doc_id. If so, adding from->to would create a cycle.
+        Asks the database (one recursive query) whether there's already a path
+        from to_doc_id back to from_doc_id. If so, adding from->to would create
+        a cycle.
 
         Args:
             from_doc_id: Source document
@@ -133,53 +142,63 @@ class DependencyService:
             True if adding this dependency would create a cycle
         """
         # If there's already a path from target back to source, this would create a cycle
-        return self._has_path(to_doc_id, from_doc_id, set())
+        return self.dep_repo.has_path(to_doc_id, from_doc_id)
 
-    def replace_document_dependencies(self, doc_id: str, content: str) -> list[str]:
+    def replace_document_dependencies(self, doc_id: str, content: str, is_new: bool = False) -> list[str]:
         """
         Extract wikilinks from content and replace all outgoing dependencies.
 
         Deep module: Owns the full lifecycle of dependency extraction from document
-        content. Deletes existing outgoing dependencies, parses wikilinks, resolves
-        targets, and creates validated new dependencies.
+        content. Parses wikilinks, resolves targets, and diffs the result
+        against the stored outgoing dependencies: stale rows are deleted and
+        only missing links are inserted (self-links and duplicate targets are
+        skipped).
 
         Args:
             doc_id: Source document ID
             content: Document markdown content containing [[wikilinks]]
+            is_new: True when the document was just created, so it cannot
+                have outgoing dependencies yet and the diff read is skipped.
 
         Returns:
             List of wikilink targets that could not be resolved (empty = all good).
             Callers can use this to surface warnings about broken links.
         """
-        # Delete existing outgoing dependencies for this document (single query)
-        self.dep_repo.delete_outgoing(doc_id)
+        if '[[' not in content:
+            # No links to create. Only write when there are stale links to
+            # remove, so saves of link-free documents stay read-only here.
+            if not is_new and self.dep_repo.has_outgoing(doc_id):
+                self.dep_repo.delete_outgoing(doc_id)
+            return []
 
-        # Extract wikilinks, filter URLs, batch-resolve in 4 queries total
-        wikilink_targets = self._extract_wikilinks(content)
-        internal_targets = {
-            t for t in wikilink_targets
-            if not t.startswith(('http://', 'https://', 'ftp://'))
-        }
+        # Extract internal wikilinks, batch-resolve in a single query
+        internal_targets = self._extract_wikilinks(content)
 
         resolved = self._resolve_wikilinks_batch(internal_targets)
         unresolved = sorted(internal_targets - set(resolved.keys()))
 
-        for target, target_doc_id in resolved.items():
-            if target_doc_id == doc_id:
-                continue
-            dependency = DependencyCreate(
-                from_doc_id=doc_id,
-                to_doc_id=target_doc_id,
-                link_type="wikilink",
-                link_text=target
-            )
-            try:
-                self.create_dependency(dependency)
-            except (DocumentNotFoundError, CircularDependencyError, SelfDependencyError) as e:
-                logger.warning(
-                    f"Skipped dependency from {doc_id} to {target_doc_id}: {e}",
-                    extra={'from_doc_id': doc_id, 'to_doc_id': target_doc_id}
-                )
+        # Desired outgoing links: to_doc_id -> link_text. Several targets may
+        # resolve to the same document: first one (sorted) wins.
+        desired: dict[str, str] = {}
+        for target in sorted(resolved):
+            target_doc_id = resolved[target]
+            if target_doc_id != doc_id:
+                desired.setdefault(target_doc_id, target)
+
+        # Diff against what is stored so unchanged links cost no writes.
+        # Plain tuples and dicts throughout: no ORM rows or schema objects.
+        stale_ids: list[int] = []
+        if not is_new:
+            for dep_id, to_doc_id, link_type, link_text in self.dep_repo.get_outgoing_links(doc_id):
+                if link_type == "wikilink" and desired.get(to_doc_id) == link_text:
+                    del desired[to_doc_id]
+                else:
+                    stale_ids.append(dep_id)
+        self.dep_repo.delete_by_ids(stale_ids)
+
+        # Targets come from active documents and wikilinks skip cycle checks,
+        # so create_dependency()'s per-link validation would only add queries.
+        self.dep_repo.create_wikilinks(doc_id, desired)
 
         if unresolved:
             logger.info(
@@ -189,17 +208,20 @@ class DependencyService:
         return unresolved
 
     def _extract_wikilinks(self, content: str) -> Set[str]:
-        """Extract all wikilink targets from markdown content.
+        """Extract internal wikilink targets from markdown content.
 
         Handles both simple [[Target]] and display text [[Target|display]] syntax.
-        For [[Target|display]], only the Target part is returned.
+        For [[Target|display]], only the Target part is returned. External URL
+        targets ([[https://...]]) are dropped.
         """
-        pattern = r'\[\[([^\]]+)\]\]'
-        matches = re.findall(pattern, content)
-        # Handle pipe syntax: [[Target|display text]] -> Target
+        # Most documents have no wikilinks; a substring check is far cheaper
+        # than a regex scan over the whole content.
+        if '[[' not in content:
+            return set()
+
         targets = set()
-        for match in matches:
-            target = match.split('|')[0].strip()
+        for match in _WIKILINK_RE.finditer(content):
+            target = match.group(1).strip()
             if target:
                 targets.add(target)
         return targets
@@ -207,17 +229,44 @@ class DependencyService:
     def resolve_wikilink(self, target: str) -> Optional[str]:
         """Resolve a single wikilink target to a document ID.
 
-        For bulk resolution, prefer _resolve_wikilinks_batch() which does
-        4 queries total instead of 4 per target.
+        Ranks the 4 resolution stages with a CASE expression so the database
+        returns only the best match (one row, one round-trip). For bulk
+        resolution, prefer _resolve_wikilinks_batch() which does one query
+        total instead of one per target.
         """
-        result = self._resolve_wikilinks_batch({target})
-        return result.get(target)
+        if target in self._resolve_cache:
+            return self._resolve_cache[target]
+
+        from sqlalchemy import case, func, or_
+        from ..models import Document
+
+        target_lower = target.lower()
+        rank = case(
+            (Document.title == target, 1),
+            (func.lower(Document.title) == target_lower, 2),
+            (Document.repo_name == target, 3),
+            else_=4,
+        )
+        row = self.db.query(Document.id).filter(
+            Document.deleted_at.is_(None),
+            or_(
+                func.lower(Document.title) == target_lower,
+                func.lower(Document.repo_name) == target_lower,
+            ),
+        ).order_by(rank).first()
+
+        doc_id = row[0] if row else None
+        self._resolve_cache[target] = doc_id
+        return doc_id
 
     def _resolve_wikilinks_batch(self, targets: Set[str]) -> dict[str, str]:
         """Batch-resolve wikilink targets to document IDs.
 
-        Uses the same 4-stage resolution strategy as resolve_wikilink() but
-        resolves all targets in 4 queries total instead of 4*N.
+        Fetches every candidate in a single case-insensitive query on title
+        and repo_name, then applies the 4-stage precedence in Python:
+        exact title, case-insensitive title, exact repo_name,
+        case-insensitive repo_name. Targets already resolved by this service
+        instance (hit or miss) are served from the memo without a query.
 
         Returns:
             Dict mapping target string -> document ID for resolved targets only.
@@ -226,70 +275,65 @@ class DependencyService:
         if not targets:
             return {}
 
-        from sqlalchemy import func
-        from ..models import Document
+        cache = self._resolve_cache
+        pending = {t for t in targets if t not in cache}
+        if pending:
+            cache.update(self._query_wikilink_targets(pending))
 
-        active = Document.deleted_at.is_(None)
         resolved: dict[str, str] = {}
-        remaining = set(targets)
+        for target in targets:
+            doc_id = cache[target]
+            if doc_id:
+                resolved[target] = doc_id
+        return resolved
 
-        # Stage 1: Exact title match (1 query for all targets)
-        docs = self.db.query(Document.id, Document.title).filter(
-            active, Document.title.in_(remaining)
-        ).all()
-        for doc_id, title in docs:
-            for target in list(remaining):
-                if title == target:
-                    resolved[target] = doc_id
-                    remaining.discard(target)
-                    break
-
-        if not remaining:
-            return resolved
-
-        # Stage 2: Case-insensitive title match (1 query)
-        lower_remaining = {t.lower() for t in remaining}
-        docs = self.db.query(Document.id, Document.title).filter(
-            active, func.lower(Document.title).in_(lower_remaining)
-        ).all()
-        for doc_id, title in docs:
-            title_lower = title.lower() if title else ""
-            for target in list(remaining):
-                if target.lower() == title_lower:
-                    resolved[target] = doc_id
-                    remaining.discard(target)
-                    break
-
-        if not remaining:
-            return resolved
-
-        # Stage 3: Exact repo_name match (1 query)
-        docs = self.db.query(Document.id, Document.repo_name).filter(
-            active, Document.repo_name.in_(remaining)
-        ).all()
-        for doc_id, repo_name in docs:
-            for target in list(remaining):
-                if repo_name == target:
-                    resolved[target] = doc_id
-                    remaining.discard(target)
-                    break
-
-        if not remaining:
-            return resolved
-
-        # Stage 4: Case-insensitive repo_name match (1 query)
-        lower_remaining = {t.lower() for t in remaining}
-        docs = self.db.query(Document.id, Document.repo_name).filter(
-            active, func.lower(Document.repo_name).in_(lower_remaining)
+    def _prime_resolve_cache(self, contents: Iterable[str]) -> None:
+        """Resolve the wikilinks of many documents up front in one query.
+
+        Fan-outs that rebuild dependencies for several documents call this
+        first, so each per-document resolution is served from the memo.
+        """
+        targets: Set[str] = set()
+        for content in contents:
+            targets |= self._extract_wikilinks(content)
+        self._resolve_wikilinks_batch(targets)
+
+    def _query_wikilink_targets(self, targets: Set[str]) -> dict[str, Optional[str]]:
+        """Resolve targets against the database. Returns an entry (or None) for every target."""
+        from sqlalchemy import func, or_
+        from ..models import Document
+
+        lowered = {t.lower() for t in targets}
+        rows = self.db.query(Document.id, Document.title, Document.repo_name).filter(
+            Document.deleted_at.is_(None),
+            or_(
+                func.lower(Document.title).in_(lowered),
+                func.lower(Document.repo_name).in_(lowered),
+            ),
         ).all()
-        for doc_id, repo_name in docs:
-            repo_lower = repo_name.lower() if repo_name else ""
-            for target in list(remaining):
-                if target.lower() == repo_lower:
-                    resolved[target] = doc_id
-                    remaining.discard(target)
-                    break
 
+        # First matching row wins within each stage, as with per-stage queries
+        by_title: dict[str, str] = {}
+        by_title_lower: dict[str, str] = {}
+        by_repo: dict[str, str] = {}
+        by_repo_lower: dict[str, str] = {}
+        for doc_id, title, repo_name in rows:
+            if title:
+                by_title.setdefault(title, doc_id)
+                by_title_lower.setdefault(title.lower(), doc_id)
+            if repo_name:
+                by_repo.setdefault(repo_name, doc_id)
+                by_repo_lower.setdefault(repo_name.lower(), doc_id)
+
+        resolved: dict[str, Optional[str]] = {}
+        for target in targets:
+            target_lower = target.lower()
+            resolved[target] = (
+                by_title.get(target)
+                or by_title_lower.get(target_lower)
+                or by_repo.get(target)
+                or by_repo_lower.get(target_lower)
+            )
         return resolved
 
     def update_wikilinks_on_move(self, doc_id: str, old_identifier: str, new_identifier: str) -> int:
@@ -304,6 +348,9 @@ class DependencyService:
         if old_identifier == new_identifier:
             return 0
 
+        # The moved document's repo_name changed, so memoized resolutions are stale
+        self.clear_resolve_cache()
+
         from ..schemas.version import VersionCreate
         from ..repositories.version_repository import VersionRepository
         from ..repositories.document_repository import generate_content_preview
@@ -312,31 +359,50 @@ class DependencyService:
         deps = self.dep_repo.get_by_document(doc_id)
         incoming = deps.incoming
 
-        updated_count = 0
-        for dep in incoming:
-            referring_doc = self.doc_repo.get_by_id_optional(dep.from_doc_id)
-            if not referring_doc:
-                continue
+        # Load every referring document in one query instead of one per edge
+        referring_docs = self.doc_repo.get_by_ids([dep.from_doc_id for dep in incoming])
+
+        old_link = f"[[{old_identifier}]]"
+        new_link = f"[[{new_identifier}]]"
 
-            old_link = f"[[{old_identifier}]]"
-            new_link = f"[[{new_identifier}]]"
-            if old_link not in referring_doc.content:
+        updated_docs = []
+        versions = []
+        for referring_doc in referring_docs:
+            # Single pass: replace() returns an equal string when nothing matched
+            new_content = referring_doc.content.replace(old_link, new_link)
+            if new_content == referring_doc.content:
                 continue
 
-            referring_doc.content = referring_doc.content.replace(old_link, new_link)
+            referring_doc.content = new_content
             referring_doc.content_preview = generate_content_preview(referring_doc.content)
 
-            version = VersionCreate(
+            versions.append(VersionCreate(
                 doc_id=referring_doc.id,
                 content=referring_doc.content,
                 author_type="system",
                 author_metadata={"reason": "wikilink_update", "moved_doc": doc_id},
-            )
-            version_repo.create(version)
-            self.replace_document_dependencies(referring_doc.id, referring_doc.content)
-            updated_count += 1
+            ))
+            updated_docs.append(referring_doc)
 
-        return updated_count
+        # One flush for all system versions instead of a flush per document
+        version_repo.create_many(versions)
+
+        if not updated_docs:
+            return 0
+
+        updated_ids = [d.id for d in updated_docs]
+        if self._resolve_wikilinks_batch({new_identifier}).get(new_identifier) == doc_id:
+            # The rewritten link still points at the moved document, so the
+            # graph is unchanged: only the stored link text needs updating.
+            self.dep_repo.update_link_text(updated_ids, doc_id, old_identifier, new_identifier)
+        else:
+            # The new name resolves elsewhere (e.g. another document's title
+            # takes precedence); rebuild the affected documents' links.
+            self._prime_resolve_cache(d.content for d in updated_docs)
+            for referring_doc in updated_docs:
+                self.replace_document_dependencies(referring_doc.id, referring_doc.content)
+
+        return len(updated_docs)
 
     def update_incoming_dependencies(self, new_doc_id: str, new_doc_title: str) -> int:
         """Find existing documents with wikilinks to new_doc_title and update their dependencies.
@@ -348,36 +414,41 @@ class DependencyService:
         """
         from ..models import Document
 
-        # Find documents containing [[new_doc_title]] in their content
+        # A new document may now satisfy previously unresolved targets
+        self.clear_resolve_cache()
+
+        # Find documents containing [[new_doc_title]] in their content.
+        # Served by the partial pg_trgm index idx_documents_content_trgm
+        # (migration 016) rather than a sequential scan of every document.
         pattern = f"[[{new_doc_title}]]"
-        docs = self.db.query(Document).filter(
+        # Only id and content are needed, so skip hydrating full ORM rows.
+        docs = self.db.query(Document.id, Document.content).filter(
             Document.deleted_at.is_(None),
-            Document.content.contains(pattern)
+            Document.content.contains(pattern),
+            Document.id != new_doc_id,
         ).all()
 
-        updated = 0
+        self._prime_resolve_cache(doc.content for doc in docs)
         for doc in docs:
-            if doc.id != new_doc_id:
-                self.replace_document_dependencies(doc.id, doc.content)
-                updated += 1
+            self.replace_document_dependencies(doc.id, doc.content)
 
-        return updated
+        return len(docs)
 
-    def get_broken_links(self, doc_id: str) -> list[BrokenLinkInfo]:
+    def get_broken_links(self, doc_id: str, *, content: Optional[str] = None) -> list[BrokenLinkInfo]:
         """Check all wikilinks in a document and report their resolution status.
 
+        Callers that already loaded the document pass its *content* to skip
+        the re-fetch.
+
         Returns a list of BrokenLinkInfo objects.
         An empty list means no wikilinks (not an error).
         """
-        doc = self.doc_repo.get_by_id_optional(doc_id)
-        if not doc:
-            return []
+        if content is None:
+            content = self.doc_repo.get_content(doc_id)
+            if content is None:
+                return []
 
-        targets = self._extract_wikilinks(doc.content)
-        internal_targets = {
-            t for t in targets
-            if not t.startswith(('http://', 'https://', 'ftp://'))
-        }
+        internal_targets = self._extract_wikilinks(content)
 
         resolved = self._resolve_wikilinks_batch(internal_targets)
 
@@ -389,30 +460,3 @@ class DependencyService:
             )
             for target in sorted(internal_targets)
         ]
-
-    def _has_path(self, start: str, target: str, visited: Set[str]) -> bool:
-        """
-        Iterative DFS to check if there's a path from start to target.
-
-        Uses an explicit stack instead of recursion to avoid
-        ``RecursionError`` on deep dependency chains.
-
-        Args:
-            start: Starting document ID
-            target: Target document ID to reach
-            visited: Set of already-visited nodes (prevents infinite loops)
-
-        Returns:
-            True if path exists from start to target
-        """
-        stack = [start]
-        while stack:
-            node = stack.pop()
-            if node == target:
-                return True
-            if node in visited:
-                continue
-            visited.add(node)
-            for dep in self.dep_repo.get_by_source(node):
-                stack.append(dep.to_doc_id)
-        return False
@@ -9,6 +9,7 @@ is hidden behind the interface.
 from sqlalchemy.orm import Session
 import sqlalchemy.exc
 from typing import List, Optional
+import functools
 import hashlib
 import logging
 from ..models import Document
@@ -27,6 +28,18 @@ DOC_ID_PATH_HASH_LENGTH = 12
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=8192)
+def _repo_hash(normalized_url: str) -> str:
+    """Truncated SHA-256 of a normalized repo URL (shared by every doc in the repo)."""
+    return hashlib.sha256(normalized_url.encode()).hexdigest()[:DOC_ID_REPO_HASH_LENGTH]
+
+
+@functools.lru_cache(maxsize=8192)
+def _path_hash(full_path: str) -> str:
+    """Truncated SHA-256 of a document's path/title."""
+    return hashlib.sha256(full_path.encode()).hexdigest()[:DOC_ID_PATH_HASH_LENGTH]
+
+
 class DocumentService:
     """Deep module for document operations.
 
@@ -40,6 +53,9 @@ class DocumentService:
         self.doc_repo = DocumentRepository(db)
         self.version_repo = VersionRepository(db)
         self.dep_service = DependencyService(db)
+        # Set by create_or_update_documents(): versions are collected here
+        # (latest per document) and inserted together instead of one by one.
+        self._pending_versions: Optional[dict[str, VersionCreate]] = None
 
     @staticmethod
     def _normalize_repo_url(repo_url: str) -> str:
@@ -56,20 +72,31 @@ class DocumentService:
 
     def generate_doc_id(self, repo_url: Optional[str], path: str = "", title: str = "", doc_type: str = "") -> str:
         """Generate stable document ID."""
+        return self._compute_doc_id(repo_url, path, title, doc_type)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def _compute_doc_id(repo_url: Optional[str], path: str, title: str, doc_type: str) -> str:
+        """Hash inputs into a document ID. Pure, so results are memoized.
+
+        Bulk ingestion regenerates IDs for the same (repo, path, title)
+        repeatedly; the cache skips re-hashing. Debug logging only fires on
+        a cache miss.
+        """
         # Standalone documents (no repository)
         if not repo_url:
             full_path = f"{path}/{title}" if path else title
-            path_hash = hashlib.sha256(full_path.encode()).hexdigest()[:DOC_ID_PATH_HASH_LENGTH]
+            path_hash = _path_hash(full_path)
             doc_id = f"doc-standalone-{path_hash}"
             logger.debug(f"Generated standalone doc_id={doc_id} for path={path}, title={title}")
             return doc_id
 
-        normalized_url = self._normalize_repo_url(repo_url)
-        repo_hash = hashlib.sha256(normalized_url.encode()).hexdigest()[:DOC_ID_REPO_HASH_LENGTH]
+        normalized_url = DocumentService._normalize_repo_url(repo_url)
+        repo_hash = _repo_hash(normalized_url)
 
         if path or title:
             full_path = f"{path}/{title}" if path else title
-            path_hash = hashlib.sha256(full_path.encode()).hexdigest()[:DOC_ID_PATH_HASH_LENGTH]
+            path_hash = _path_hash(full_path)
             doc_id = f"doc-{repo_hash}-{path_hash}"
             logger.debug(f"Generated doc_id={doc_id} for repo={repo_url}, path={path}, title={title}")
             return doc_id
@@ -86,7 +113,8 @@ class DocumentService:
         """Create new document or update existing one (upsert).
 
         Handles the full lifecycle: persist document, create version,
-        and update wikilink dependencies — all in one call.
+        and update wikilink dependencies — all in one call. An upsert that
+        changes neither content nor description writes nothing.
         Returns (document, is_new) tuple.
         """
         doc_type = document.doc_type
@@ -103,6 +131,13 @@ class DocumentService:
         existing = self.doc_repo.get_by_id_optional(doc_id)
         is_new = existing is None
 
+        if existing and existing.content == document.content and (
+            document.description is None or document.description == existing.description
+        ):
+            # Re-ingesting unchanged content (e.g. a sync loop re-reading the
+            # same files) is a no-op: no UPDATE, no version, no link refresh.
+            return existing, False
+
         if existing:
             # Route through update_document() to get optimistic locking,
             # version creation, and dependency refresh in one path.
@@ -123,15 +158,41 @@ class DocumentService:
                 author_type=document.author_type,
                 author_metadata=document.author_metadata,
             )
-            self.version_repo.create(version)
+            self._record_version(version)
 
-            self.dep_service.replace_document_dependencies(doc_id, document.content)
+            self.dep_service.replace_document_dependencies(doc_id, document.content, is_new=True)
             self.dep_service.update_incoming_dependencies(doc_id, document.title)
 
         if commit:
             self.db.commit()
         return db_document, is_new
 
+    def create_or_update_documents(self, documents: List[DocumentCreate], commit: bool = True) -> list[tuple[Document, bool]]:
+        """Upsert several documents in one transaction.
+
+        Same per-document semantics as create_or_update_document(), but the
+        version rows are written with a single multi-row INSERT at the end.
+        A document listed more than once keeps only its final version.
+        Returns (document, is_new) for each input, in order.
+        """
+        self._pending_versions = {}
+        try:
+            results = [self.create_or_update_document(doc, commit=False) for doc in documents]
+            self.version_repo.create_many(list(self._pending_versions.values()))
+        finally:
+            self._pending_versions = None
+
+        if commit:
+            self.db.commit()
+        return results
+
+    def _record_version(self, version: VersionCreate) -> None:
+        """Write a version now, or queue it while a bulk upsert is running."""
+        if self._pending_versions is not None:
+            self._pending_versions[version.doc_id] = version
+        else:
+            self.version_repo.create(version)
+
     def update_document(self, doc_id: str, update_data: DocumentUpdate, commit: bool = True) -> Document:
         """Update document content, create new version, and refresh wikilink dependencies.
 
@@ -140,6 +201,11 @@ class DocumentService:
         Raises ConflictError (409) if another writer modified the document
         between the client's read and this write.
         """
+        # Callers normally loaded the document already (access check, upsert
+        # lookup), so this is an identity-map hit rather than a query.
+        current = self.db.get(Document, doc_id)
+        content_changed = current is None or current.content != update_data.content
+
         updated = self.doc_repo.update(doc_id, update_data, expected_version=update_data.version)
 
         version = VersionCreate(
@@ -148,10 +214,11 @@ class DocumentService:
             author_type=update_data.author_type,
             author_metadata=update_data.author_metadata
         )
-        self.version_repo.create(version)
+        self._record_version(version)
 
-        # Refresh wikilink dependencies from new content
-        self.dep_service.replace_document_dependencies(doc_id, update_data.content)
+        # Refresh wikilink dependencies only when the links could have changed
+        if content_changed:
+            self.dep_service.replace_document_dependencies(doc_id, update_data.content)
 
         if commit:
             self.db.commit()
@@ -161,7 +228,7 @@ class DocumentService:
         """Get document by ID. Returns None if not found (caller decides on 404)."""
         return self.doc_repo.get_by_id_optional(doc_id)
 
-    def get_document_authorized(self, doc_id: str, grants: list, action: str) -> Document:
+    def get_document_authorized(self, doc_id: str, grants: list | dict, action: str) -> Document:
         """Load a document and verify permission in one call.
 
         Returns 404 (not 403) when access is denied — the document appears
@@ -182,8 +249,9 @@ class DocumentService:
     def list_documents(self, skip: int = 0, limit: int = 100, path_prefix: Optional[str] = None, repo_url: Optional[str] = None, allowed_prefixes: Optional[list[str]] = None) -> List[DocumentListResponse]:
         """List all documents."""
         documents = self.doc_repo.get_all(skip, limit, path_prefix, repo_url=repo_url, allowed_prefixes=allowed_prefixes)
+        # Trusted ORM rows: model_construct skips per-row validation
         return [
-            DocumentListResponse(
+            DocumentListResponse.model_construct(
                 id=doc.id,
                 repo_name=doc.repo_name,
                 doc_type=doc.doc_type,
@@ -207,26 +275,30 @@ class DocumentService:
     def delete_document(self, doc_id: str) -> bool:
         """Soft-delete document (moves to trash). Idempotent."""
         result = self.doc_repo.soft_delete(doc_id)
+        self.dep_service.clear_resolve_cache()
         self.db.commit()
         return result
 
     def restore_document(self, doc_id: str) -> Document:
         """Restore a soft-deleted document. Raises DocumentNotFoundError if not found."""
         result = self.doc_repo.restore(doc_id)
+        self.dep_service.clear_resolve_cache()
         self.db.commit()
         return result
 
     def permanent_delete_document(self, doc_id: str) -> bool:
         """Permanently delete a document. Idempotent."""
         result = self.doc_repo.permanent_delete(doc_id)
+        self.dep_service.clear_resolve_cache()
         self.db.commit()
         return result
 
     def list_trash(self, skip: int = 0, limit: int = 100, allowed_prefixes: Optional[list[str]] = None) -> List[DocumentListResponse]:
         """List soft-deleted documents."""
         documents = self.doc_repo.get_deleted(skip, limit, allowed_prefixes=allowed_prefixes)
+        # Trusted ORM rows: model_construct skips per-row validation
         return [
-            DocumentListResponse(
+            DocumentListResponse.model_construct(
                 id=doc.id,
                 repo_name=doc.repo_name,
                 doc_type=doc.doc_type,
@@ -244,12 +316,23 @@ class DocumentService:
             for doc in documents
         ]
 
+    # Documents permanently deleted per transaction when purging the trash.
+    # Bounds lock time and transaction size for large cleanups.
+    PURGE_CHUNK_SIZE = 1000
+
     def purge_expired_trash(self, days: int = 30) -> int:
-        """Permanently delete documents in trash older than `days`."""
-        count = self.doc_repo.purge_expired(days)
-        if count > 0:
-            self.db.commit()
-        return count
+        """Permanently delete documents in trash older than `days`.
+
+        Deletes in chunks of PURGE_CHUNK_SIZE, committing after each one.
+        """
+        total = 0
+        while True:
+            count = self.doc_repo.purge_expired(days, limit=self.PURGE_CHUNK_SIZE)
+            if count > 0:
+                self.db.commit()
+                total += count
+            if count < self.PURGE_CHUNK_SIZE:
+                return total
 
     def move_document(self, doc_id: str, target_path: str, commit: bool = True) -> Document:
         """Move a document to a different folder path.
@@ -272,16 +355,22 @@ class DocumentService:
 
         Returns (document, old_repo_name, new_repo_name) for caller to update wikilinks if needed.
         """
+        return self._move_normalized(doc_id, target_path.strip().strip('/'))
+
+    def _move_normalized(self, doc_id: str, target_path: str) -> tuple[Document, str | None, str | None]:
+        """_move_document_impl for a target_path that is already stripped (batch moves)."""
         doc = self.doc_repo.get_by_id(doc_id)
         old_repo_name = doc.repo_name
-        target_path = target_path.strip().strip('/')
         doc.path = target_path
         # repo_name is a plain column (not derived), so update it to match
         # the new path's top-level segment.
         if target_path:
             doc.repo_name = target_path.split('/')[0]
+        self.dep_service.clear_resolve_cache()
+        # Flush so wikilink resolution sees the new repo_name. No refresh:
+        # every changed value was computed here, and server-side updated_at
+        # is expired by the flush and loads on first access.
         self.db.flush()
-        self.db.refresh(doc)
 
         return doc, old_repo_name, doc.repo_name
 
@@ -326,7 +415,7 @@ class DocumentService:
         operation: str,
         doc_ids: list[str],
         params: BatchParams,
-        grants: list,
+        grants: list | dict,
         is_service_account: bool = False,
     ) -> BatchResult:
         """Execute a batch operation with permission filtering.
@@ -334,28 +423,32 @@ class DocumentService:
         Service accounts can only delete AI-authored documents.
         Normal users are filtered by path-based grants.
         Denied documents are reported as errors, not silently dropped.
+        Duplicate IDs are checked and counted once.
         """
-        from ..services.permission_service import check_permission
+        from ..services.permission_service import check_permission, compile_grants
+
+        doc_ids = list(dict.fromkeys(doc_ids))
 
         allowed_ids: list[str] = []
         denied_ids: list[str] = []
 
+        # Permission data for every ID is loaded up front (one or two
+        # queries) instead of per-document lookups.
         if is_service_account and operation == "delete":
+            existing = self.doc_repo.get_existing_ids(doc_ids)
+            latest_authors = self.version_repo.get_latest_author_types(list(existing))
             for doc_id in doc_ids:
-                doc = self.get_document(doc_id)
-                if doc is None:
-                    denied_ids.append(doc_id)
-                    continue
-                latest = self.version_repo.get_latest(doc_id)
-                if latest and latest.author_type == "ai":
+                if latest_authors.get(doc_id) == "ai":
                     allowed_ids.append(doc_id)
                 else:
                     denied_ids.append(doc_id)
         else:
             action = "delete" if operation == "delete" else "edit"
+            compiled = compile_grants(grants)
+            paths = self.doc_repo.get_paths(doc_ids)
             for doc_id in doc_ids:
-                doc = self.get_document(doc_id)
-                if doc is not None and check_permission(grants, doc.path, action):
+                path = paths.get(doc_id)
+                if path is not None and check_permission(compiled, path, action):
                     allowed_ids.append(doc_id)
                 else:
                     denied_ids.append(doc_id)
@@ -379,9 +472,11 @@ class DocumentService:
         """Execute a batch operation on multiple documents.
 
         Returns a BatchResult with total, succeeded, failed, errors.
-        Empty doc_ids returns zero counts (not an error).
+        Duplicate IDs are processed (and counted) once; empty doc_ids
+        returns zero counts (not an error) without touching the session.
         Partial failures are reported in errors, not raised as exceptions.
         """
+        doc_ids = list(dict.fromkeys(doc_ids))
         if operation not in self._KNOWN_BATCH_OPS:
             return BatchResult(
                 total=len(doc_ids),
@@ -391,34 +486,78 @@ class DocumentService:
             )
 
         total = len(doc_ids)
-        succeeded = 0
-        errors: list[BatchError] = []
-
-        for doc_id in doc_ids:
-            savepoint = self.db.begin_nested()
-            try:
-                if operation == "delete":
-                    self.doc_repo.soft_delete(doc_id)
-                    succeeded += 1
-                elif operation == "move":
-                    self._move_document_impl(doc_id, params.target_path)
-                    succeeded += 1
-                elif operation == "add_keywords":
-                    doc = self.doc_repo.get_by_id(doc_id)
-                    existing = doc.keywords or []
-                    doc.keywords = list(set(existing + params.keywords))
-                    succeeded += 1
-                elif operation == "remove_keywords":
-                    kw_to_remove = set(params.keywords)
-                    doc = self.doc_repo.get_by_id(doc_id)
-                    doc.keywords = [k for k in (doc.keywords or []) if k not in kw_to_remove]
-                    succeeded += 1
-                savepoint.commit()
-            except (IsoException, ValueError, sqlalchemy.exc.IntegrityError) as e:
-                savepoint.rollback()
-                logger.warning("Batch %s failed for %s: %s", operation, doc_id, e, exc_info=True)
-                errors.append(BatchError(doc_id=doc_id, error=str(e)))
+        if not doc_ids:
+            return BatchResult(total=0, succeeded=0, failed=0, errors=[])
+
+        if operation == "delete":
+            # One atomic UPDATE ... RETURNING id instead of a savepoint per
+            # document; IDs that matched no row are reported as failures.
+            found = self.doc_repo.soft_delete_many(doc_ids)
+            errors = [
+                BatchError(doc_id=doc_id, error=str(DocumentNotFoundError(doc_id)))
+                for doc_id in doc_ids if doc_id not in found
+            ]
+            self.dep_service.clear_resolve_cache()
+            self.db.commit()
+            return BatchResult(total=total, succeeded=total - len(errors), failed=len(errors), errors=errors)
+
+        if operation in ("add_keywords", "remove_keywords"):
+            # Keyword edits cannot fail per document: one SELECT of
+            # (id, keywords) and one executemany UPDATE, no savepoints.
+            # Documents whose keywords would not change are left out of the
+            # UPDATE. Added keywords merge into a sorted, deterministic list.
+            current = self.doc_repo.get_keywords_many(doc_ids)
+            kw_set = frozenset(params.keywords)
+            updates: dict[str, list] = {}
+            for doc_id, existing in current.items():
+                if operation == "add_keywords":
+                    new_kw = sorted(kw_set.union(existing))
+                else:
+                    new_kw = [k for k in existing if k not in kw_set]
+                if new_kw != existing:
+                    updates[doc_id] = new_kw
+            self.doc_repo.update_keywords_many(updates)
+            errors = [
+                BatchError(doc_id=doc_id, error=str(DocumentNotFoundError(doc_id)))
+                for doc_id in doc_ids if doc_id not in current
+            ]
+            self.db.commit()
+            return BatchResult(total=total, succeeded=total - len(errors), failed=len(errors), errors=errors)
+
+        # Move. Unknown IDs are found with one query up front; the rest run
+        # in a single savepoint. Only if that fails do we redo them with one
+        # savepoint per document, so a bad document rolls back alone.
+        target_path = params.target_path.strip().strip('/')
+        existing = self.doc_repo.get_existing_ids(doc_ids)
+        valid_ids = [doc_id for doc_id in doc_ids if doc_id in existing]
+        errors = [
+            BatchError(doc_id=doc_id, error=str(DocumentNotFoundError(doc_id)))
+            for doc_id in doc_ids if doc_id not in existing
+        ]
 
+        try:
+            with self.db.begin_nested():
+                for doc_id in valid_ids:
+                    self._move_normalized(doc_id, target_path)
+            succeeded = len(valid_ids)
+        except (IsoException, ValueError, sqlalchemy.exc.IntegrityError):
+            logger.info("Batch %s failed as a whole, retrying per document", operation, exc_info=True)
+            succeeded = 0
+            for doc_id in valid_ids:
+                savepoint = self.db.begin_nested()
+                try:
+                    self._move_normalized(doc_id, target_path)
+                    succeeded += 1
+                    savepoint.commit()
+                except (IsoException, ValueError, sqlalchemy.exc.IntegrityError) as e:
+                    savepoint.rollback()
+                    logger.warning("Batch %s failed for %s: %s", operation, doc_id, e, exc_info=True)
+                    errors.append(BatchError(doc_id=doc_id, error=str(e)))
+            # Report errors in request order, as a per-document loop would
+            position = {doc_id: i for i, doc_id in enumerate(doc_ids)}
+            errors.sort(key=lambda err: position[err.doc_id])
+
+        self.dep_service.clear_resolve_cache()
         self.db.commit()
         return BatchResult(
             total=total,
@@ -4,7 +4,13 @@ Provider-agnostic via LiteLLM — supports OpenAI, Cohere, Ollama, and any
 OpenAI-compatible endpoint. Configure via EMBEDDING_MODEL env var.
 """
 
+import functools
+import hashlib
 import logging
+import threading
+from array import array
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from sqlalchemy.orm import Session
 
 from ..core.config import settings
@@ -14,6 +20,75 @@ from ..schemas.document import SimilarDocumentResponse
 logger = logging.getLogger(__name__)
 
 
+def _base_kwargs() -> dict:
+    """LiteLLM kwargs shared by every embedding call. Treat as read-only."""
+    return _build_base_kwargs(
+        settings.embedding_model,
+        settings.embedding_api_key,
+        settings.embedding_api_base,
+        settings.embedding_dimensions,
+    )
+
+
+@functools.lru_cache(maxsize=8)
+def _build_base_kwargs(model: str, api_key: str, api_base: str, dimensions: int) -> dict:
+    # Keyed on the setting values, so a changed setting builds a fresh dict
+    kwargs: dict = {"model": model}
+    if api_key:
+        kwargs["api_key"] = api_key
+    if api_base:
+        kwargs["api_base"] = api_base
+    if dimensions:
+        kwargs["dimensions"] = dimensions
+    return kwargs
+
+
+# Query vectors kept for repeated similarity searches, least recently used
+# evicted first. Vectors are stored as float32 arrays (pgvector's own
+# precision), about 6 KB each at 1536 dimensions.
+_QUERY_CACHE_SIZE = 128
+_query_cache: OrderedDict[tuple, array] = OrderedDict()
+_query_cache_lock = threading.Lock()
+
+
+def _query_embedding(text: str) -> array | None:
+    """Embedding for a search query, served from the query cache when possible.
+
+    Keyed on the embedding space (model, endpoint, dimensions) and a digest
+    of the text, so neither the API key nor long query strings are retained.
+    Failed lookups are not cached.
+    """
+    key = (
+        settings.embedding_model,
+        settings.embedding_api_base,
+        settings.embedding_dimensions,
+        hashlib.sha256(text.encode()).digest(),
+    )
+    with _query_cache_lock:
+        vector = _query_cache.get(key)
+        if vector is not None:
+            _query_cache.move_to_end(key)
+            return vector
+
+    embedding = EmbeddingService.generate_embedding(text)
+    if not embedding:
+        return None
+    vector = array("f", embedding)
+
+    with _query_cache_lock:
+        _query_cache[key] = vector
+        _query_cache.move_to_end(key)
+        while len(_query_cache) > _QUERY_CACHE_SIZE:
+            _query_cache.popitem(last=False)
+    return vector
+
+
+def clear_query_cache() -> None:
+    """Drop all cached query vectors (tests, or after reconfiguring embeddings)."""
+    with _query_cache_lock:
+        _query_cache.clear()
+
+
 class EmbeddingService:
     """Generates and manages document description embeddings."""
 
@@ -38,18 +113,7 @@ class EmbeddingService:
         try:
             import litellm
 
-            kwargs: dict = {
-                "model": settings.embedding_model,
-                "input": [text],
-            }
-            if settings.embedding_api_key:
-                kwargs["api_key"] = settings.embedding_api_key
-            if settings.embedding_api_base:
-                kwargs["api_base"] = settings.embedding_api_base
-            if settings.embedding_dimensions:
-                kwargs["dimensions"] = settings.embedding_dimensions
-
-            response = litellm.embedding(**kwargs)
+            response = litellm.embedding(input=[text], **_base_kwargs())
             return response.data[0]["embedding"]
 
         except (litellm.exceptions.APIError, litellm.exceptions.APIConnectionError,
@@ -65,11 +129,12 @@ class EmbeddingService:
         if not self.is_configured():
             return False
 
-        doc = self.doc_repo.get_by_id_optional(doc_id)
-        if not doc or not doc.description:
+        # Only the description is embedded; don't load the content column
+        description = self.doc_repo.get_description(doc_id)
+        if not description:
             return False
 
-        embedding = self.generate_embedding(doc.description)
+        embedding = self.generate_embedding(description)
         if not embedding:
             return False
 
@@ -88,12 +153,14 @@ class EmbeddingService:
         if not self.is_configured():
             return []
 
-        embedding = self.generate_embedding(text)
-        if not embedding:
+        # Repeated queries (debounced search, the same doc's "similar" panel)
+        # reuse the vector instead of another provider round-trip.
+        embedding = _query_embedding(text)
+        if embedding is None:
             return []
 
         return self.doc_repo.search_by_vector(
-            query_embedding=embedding,
+            query_embedding=embedding.tolist(),
             limit=limit,
             exclude_id=exclude_id,
             allowed_prefixes=allowed_prefixes,
@@ -106,12 +173,12 @@ class EmbeddingService:
         allowed_prefixes: list[str] | None = None,
     ) -> list[SimilarDocumentResponse]:
         """Find documents similar to an existing document."""
-        doc = self.doc_repo.get_by_id(doc_id)
-        if not doc or not doc.description:
+        description = self.doc_repo.get_description(doc_id)
+        if not description:
             return []
 
         return self.find_similar(
-            text=doc.description,
+            text=description,
             limit=limit,
             exclude_id=doc_id,
             allowed_prefixes=allowed_prefixes,
@@ -130,18 +197,7 @@ class EmbeddingService:
         try:
             import litellm
 
-            kwargs: dict = {
-                "model": settings.embedding_model,
-                "input": texts,
-            }
-            if settings.embedding_api_key:
-                kwargs["api_key"] = settings.embedding_api_key
-            if settings.embedding_api_base:
-                kwargs["api_base"] = settings.embedding_api_base
-            if settings.embedding_dimensions:
-                kwargs["dimensions"] = settings.embedding_dimensions
-
-            response = litellm.embedding(**kwargs)
+            response = litellm.embedding(input=texts, **_base_kwargs())
             return [item["embedding"] for item in response.data]
 
         except Exception:
@@ -156,26 +212,32 @@ class EmbeddingService:
         """Re-embed all documents with descriptions. Returns count of documents embedded.
 
         Processes documents in batches to reduce API calls and respect rate limits.
+        Up to EMBEDDING_PARALLELISM provider calls run concurrently; results are
+        written in order on the calling thread, which alone uses the session.
         """
         if not self.is_configured():
             return 0
 
-        docs = [d for d in self.doc_repo.get_unembedded_documents(settings.embedding_model) if d.description]
+        # Plain (id, description) pairs: ORM rows expire on each commit below
+        docs = [(d.id, d.description) for d in self.doc_repo.get_unembedded_documents(settings.embedding_model) if d.description]
+        batches = [docs[i : i + self.REINDEX_BATCH_SIZE] for i in range(0, len(docs), self.REINDEX_BATCH_SIZE)]
         count = 0
 
-        for i in range(0, len(docs), self.REINDEX_BATCH_SIZE):
-            batch = docs[i : i + self.REINDEX_BATCH_SIZE]
-            texts = [doc.description for doc in batch]
-            embeddings = self.generate_embeddings_batch(texts)
-
-            for doc, embedding in zip(batch, embeddings):
-                if embedding:
-                    self.doc_repo.update_embedding(doc.id, embedding, settings.embedding_model)
-                    count += 1
-
-            # Commit per batch to avoid holding a long transaction
-            if count > 0:
-                self.db.commit()
+        workers = max(1, min(settings.embedding_parallelism, len(batches)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(
+                self.generate_embeddings_batch,
+                [[description for _, description in batch] for batch in batches],
+            )
+            for batch, embeddings in zip(batches, results):
+                # One UPDATE per batch rather than one per document
+                updates = {doc_id: embedding for (doc_id, _), embedding in zip(batch, embeddings) if embedding}
+                self.doc_repo.update_embeddings_many(updates, settings.embedding_model)
+                count += len(updates)
+
+                # Commit per batch to avoid holding a long transaction
+                if count > 0:
+                    self.db.commit()
 
         logger.info(f"Re-indexed {count} documents with model {settings.embedding_model}")
         return count
@@ -5,6 +5,7 @@ The public interface is intentionally narrow -- callers interact with high-level
 and never manage ancestor metadata, path validation, or tree construction themselves.
 """
 
+import functools
 import hashlib
 import logging
 from datetime import datetime, timezone
@@ -14,6 +15,7 @@ from sqlalchemy.orm import Session
 
 from ..models import Document
 from ..models.folder_metadata import FolderMetadata
+from ..repositories.base import path_prefix_filter
 from ..repositories.document_repository import DocumentRepository
 from ..repositories.folder_repository import FolderMetadataRepository
 from ..schemas.folder import (
@@ -31,6 +33,19 @@ UNCATEGORIZED_FOLDER = "Uncategorized"
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=4096)
+def _folder_id(path: str) -> str:
+    """Deterministic folder ID from path.
+
+    Memoized: creating a deep path re-derives the IDs of every ancestor,
+    and sibling paths share most of them.
+    """
+    # 12 hex chars = 48 bits, matching DOC_ID_PATH_HASH_LENGTH in document_service.py.
+    # Changing this would break existing folder IDs in the database.
+    path_hash = hashlib.sha256(path.encode()).hexdigest()[:12]
+    return f"folder-{path_hash}"
+
+
 class FolderService:
     """All folder and tree operations behind a simple interface.
 
@@ -107,28 +122,40 @@ class FolderService:
         self.db.commit()
         return result
 
-    def delete_folder(self, folder_path: str, action: str = "move_up") -> FolderOperationResponse:
+    def delete_folder(
+        self, folder_path: str, action: str = "move_up", include_tree: bool = True
+    ) -> FolderOperationResponse:
         """Delete a folder. Idempotent: succeeds with zero affected if path is missing.
 
         action='move_up'   -- contents are re-parented to the parent folder.
         action='delete_all' -- folder and all descendants are permanently removed.
+
+        With include_tree=False the response's tree is left empty, skipping
+        a full tree rebuild for callers that refetch it anyway.
         """
         if not self._path_exists(folder_path):
-            return FolderOperationResponse(
+            result = FolderOperationResponse(
                 affected_documents=0,
                 folder_path=folder_path,
-                tree=self._tree_as_dicts(),
+                tree=[],
             )
+        elif action == "delete_all":
+            result = self._delete_folder_and_contents(folder_path)
+        else:
+            result = self._delete_folder_move_up(folder_path)
 
-        if action == "delete_all":
-            return self._delete_folder_and_contents(folder_path)
-        return self._delete_folder_move_up(folder_path)
+        if include_tree:
+            result.tree = self._tree_as_dicts()
+        return result
 
-    def move_folder(self, source_path: str, target_path: str) -> FolderOperationResponse:
+    def move_folder(
+        self, source_path: str, target_path: str, include_tree: bool = True
+    ) -> FolderOperationResponse:
         """Move a folder subtree to a new location.
 
         Validates constraints, moves all documents and metadata, ensures ancestor
-        metadata at the target, and returns the refreshed tree.
+        metadata at the target, and returns the refreshed tree (unless
+        include_tree is False).
         """
         if target_path == source_path:
             raise ValueError("Source and target paths are the same")
@@ -140,19 +167,7 @@ class FolderService:
             raise ValueError(f"A folder already exists at path '{target_path}'")
 
         affected_count = self.doc_repo.move_folder(source_path, target_path)
-
-        # Re-path folder metadata
-        folder_meta = self.db.query(FolderMetadata).filter(
-            (FolderMetadata.path == source_path)
-            | (FolderMetadata.path.like(f"{source_path}/%"))
-        ).all()
-
-        for fm in folder_meta:
-            if fm.path == source_path:
-                fm.path = target_path
-            else:
-                relative = fm.path[len(source_path) + 1:]
-                fm.path = f"{target_path}/{relative}"
+        self.folder_repo.move_prefix(source_path, target_path)
 
         self._ensure_ancestors(target_path)
         self.db.commit()
@@ -162,7 +177,7 @@ class FolderService:
             folder_path=target_path,
             old_path=source_path,
             new_path=target_path,
-            tree=self._tree_as_dicts(),
+            tree=self._tree_as_dicts() if include_tree else [],
         )
 
     def get_tree(self, allowed_prefixes: Optional[List[str]] = None) -> List[TreeNode]:
@@ -171,16 +186,7 @@ class FolderService:
 
     def cleanup_orphans(self) -> int:
         """Remove folder metadata for paths that no longer contain any documents."""
-        docs = self.db.query(Document).filter(Document.deleted_at.is_(None)).all()
-
-        active_paths: set[str] = set()
-        for doc in docs:
-            if doc.path:
-                parts = doc.path.split("/")
-                for i in range(1, len(parts) + 1):
-                    active_paths.add("/".join(parts[:i]))
-
-        count = self.folder_repo.cleanup_orphans(active_paths)
+        count = self.folder_repo.cleanup_orphans()
         if count > 0:
             self.db.commit()
         return count
@@ -191,10 +197,7 @@ class FolderService:
 
     def _generate_folder_id(self, path: str) -> str:
         """Deterministic folder ID from path."""
-        # 12 hex chars = 48 bits, matching DOC_ID_PATH_HASH_LENGTH in document_service.py.
-        # Changing this would break existing folder IDs in the database.
-        path_hash = hashlib.sha256(path.encode()).hexdigest()[:12]
-        return f"folder-{path_hash}"
+        return _folder_id(path)
 
     def _ensure_ancestors(self, path: str) -> None:
         """Create FolderMetadata for every ancestor of *path* that lacks one.
@@ -202,13 +205,14 @@ class FolderService:
         For path 'a/b/c' this creates records for 'a' and 'a/b' (but not 'a/b/c').
         """
         segments = path.split("/")
-        for i in range(1, len(segments)):
-            ancestor_path = "/".join(segments[:i])
-            ancestor_id = self._generate_folder_id(ancestor_path)
-            if not self.folder_repo.get_by_id_optional(ancestor_id):
-                self.folder_repo.create(
-                    ancestor_id, FolderMetadataCreate(path=ancestor_path)
-                )
+        ancestors = [
+            (_folder_id(ancestor_path), ancestor_path)
+            for ancestor_path in ("/".join(segments[:i]) for i in range(1, len(segments)))
+        ]
+        existing = self.folder_repo.get_existing_ids([fid for fid, _ in ancestors])
+        self.folder_repo.create_many(
+            [(fid, p) for fid, p in ancestors if fid not in existing]
+        )
 
     def _is_uncategorized(self, path: str) -> bool:
         return path == UNCATEGORIZED_FOLDER
@@ -221,36 +225,31 @@ class FolderService:
         """
         if self._is_uncategorized(path):
             return (Document.path.is_(None)) | (Document.path == "")
-        return (Document.path == path) | (Document.path.like(f"{path}/%"))
+        return path_prefix_filter(Document.path, path)
 
     def _path_exists(self, path: str) -> bool:
         """True if any active documents or folder metadata exist at or under *path*."""
-        has_docs = (
+        has_docs = self.db.query(
             self.db.query(Document)
             .filter(Document.deleted_at.is_(None))
             .filter(self._doc_path_filter(path))
-            .first()
-            is not None
-        )
+            .exists()
+        ).scalar()
         if has_docs:
             return True
-        return (
+        return self.db.query(
             self.db.query(FolderMetadata)
-            .filter(
-                (FolderMetadata.path == path)
-                | (FolderMetadata.path.like(f"{path}/%"))
-            )
-            .first()
-            is not None
-        )
+            .filter(path_prefix_filter(FolderMetadata.path, path))
+            .exists()
+        ).scalar()
 
     def _has_documents_at(self, path: str) -> bool:
-        return (
+        return self.db.query(
             self.db.query(Document)
             .filter(Document.deleted_at.is_(None))
             .filter(Document.path == path)
-            .first() is not None
-        )
+            .exists()
+        ).scalar()
 
     # -- Deletion variants ------------------------------------------------
 
@@ -283,7 +282,7 @@ class FolderService:
         return FolderOperationResponse(
             affected_documents=affected_count,
             folder_path=folder_path,
-            tree=self._tree_as_dicts(),
+            tree=[],
         )
 
     def _delete_folder_move_up(self, folder_path: str) -> FolderOperationResponse:
@@ -292,67 +291,37 @@ class FolderService:
             "/".join(folder_path.split("/")[:-1]) if "/" in folder_path else ""
         )
 
-        affected_count = 0
-
         if self._is_uncategorized(folder_path):
             # "Uncategorized" is virtual — documents already have empty path,
             # there is nowhere to move them up to. Just count them.
-            docs = (
+            affected_count = (
                 self.db.query(Document)
                 .filter(Document.deleted_at.is_(None))
                 .filter(self._doc_path_filter(folder_path))
-                .all()
+                .count()
             )
-            affected_count = len(docs)
         else:
-            # Move direct documents to parent
-            docs = self.db.query(Document).filter(Document.deleted_at.is_(None)).filter(Document.path == folder_path).all()
-            for doc in docs:
-                doc.path = parent_path
-                affected_count += 1
-
-            # Move documents in subfolders: strip the deleted segment
-            subdocs = (
-                self.db.query(Document)
-                .filter(Document.deleted_at.is_(None))
-                .filter(Document.path.like(f"{folder_path}/%"))
-                .all()
-            )
-            for doc in subdocs:
-                remaining = doc.path[len(folder_path) + 1:]
-                doc.path = f"{parent_path}/{remaining}" if parent_path else remaining
-                affected_count += 1
-
-        # Delete only this folder's metadata
-        fm = (
-            self.db.query(FolderMetadata)
-            .filter(FolderMetadata.path == folder_path)
-            .first()
-        )
-        if fm:
-            self.db.delete(fm)
+            # Direct documents move to the parent; deeper ones lose the
+            # deleted segment.
+            affected_count = self.doc_repo.move_folder(folder_path, parent_path)
 
-        # Re-parent subfolder metadata
-        subfolder_meta = (
-            self.db.query(FolderMetadata)
-            .filter(FolderMetadata.path.like(f"{folder_path}/%"))
-            .all()
-        )
-        for fm in subfolder_meta:
-            remaining = fm.path[len(folder_path) + 1:]
-            fm.path = f"{parent_path}/{remaining}" if parent_path else remaining
+        # Delete only this folder's metadata, then re-parent subfolder metadata
+        self.db.query(FolderMetadata).filter(
+            FolderMetadata.path == folder_path
+        ).delete(synchronize_session="fetch")
+        self.folder_repo.move_prefix(folder_path, parent_path)
 
         self.db.commit()
         return FolderOperationResponse(
             affected_documents=affected_count,
             folder_path=folder_path,
-            tree=self._tree_as_dicts(),
+            tree=[],
         )
 
     # -- Tree building ----------------------------------------------------
 
     def _tree_as_dicts(self) -> List[Dict[str, Any]]:
-        return [node.dict() for node in self._build_tree()]
+        return [node.model_dump() for node in self._build_tree()]
 
     def _build_tree(self, allowed_prefixes: Optional[List[str]] = None) -> List[TreeNode]:
         """Build hierarchical tree from documents and folder metadata.
@@ -363,91 +332,71 @@ class FolderService:
         When *allowed_prefixes* is provided, only documents under those path
         prefixes are loaded from the database.
         """
-        documents = self.doc_repo.get_all(limit=TREE_DOCUMENT_LIMIT, allowed_prefixes=allowed_prefixes)
-        folder_metadata_list = self.folder_repo.get_all()
-
-        # Index folder metadata by path
-        metadata_map: Dict[str, Dict] = {}
-        for fm in folder_metadata_list:
-            metadata_map[fm.path] = {
-                "description": fm.description,
-                "icon": fm.icon,
-                "sort_order": fm.sort_order,
-            }
-
-        tree_dict: Dict = {}
-
-        def ensure_path(path_segments: List[str]) -> Dict:
-            """Ensure all segments exist in the tree, return the leaf node dict."""
-            current_children = tree_dict
-            node = None
-            for seg in path_segments:
-                if seg not in current_children:
-                    current_children[seg] = {"_children": {}, "_docs": []}
-                node = current_children[seg]
-                current_children = node["_children"]
-            return node
+        documents = self.doc_repo.get_all_for_tree(TREE_DOCUMENT_LIMIT, allowed_prefixes)
+        metadata_map = {fm.path: fm for fm in self.folder_repo.get_all_for_tree()}
+
+        roots: List[TreeNode] = []
+        node_by_path: Dict[str, TreeNode] = {}
+
+        def ensure_path(path: str) -> None:
+            """Create folder nodes for *path* and any missing ancestors."""
+            if path in node_by_path:
+                return
+            full = ""
+            parent: Optional[TreeNode] = None
+            for seg in path.split("/"):
+                full = f"{full}/{seg}" if parent is not None else seg
+                node = node_by_path.get(full)
+                if node is None:
+                    metadata = metadata_map.get(full)
+                    node = TreeNode.model_construct(
+                        id=f"folder-{full}",
+                        name=seg,
+                        type="folder",
+                        is_crate=parent is None,
+                        doc_type=None,
+                        path=full,
+                        description=metadata.description if metadata else None,
+                        icon=metadata.icon if metadata else None,
+                        children=[],
+                    )
+                    # Folders named "_..." are hidden along with everything
+                    # under them: still indexed, never attached to the tree.
+                    if not seg.startswith("_"):
+                        (parent.children if parent is not None else roots).append(node)
+                    node_by_path[full] = node
+                parent = node
 
         for doc in documents:
-            path = doc.path or UNCATEGORIZED_FOLDER
-            node = ensure_path(path.split("/"))
-            node["_docs"].append(doc)
+            ensure_path(doc.path or UNCATEGORIZED_FOLDER)
 
         for fm_path in metadata_map:
-            ensure_path(fm_path.split("/"))
-
-        return self._dict_to_tree(tree_dict, "", metadata_map, is_top_level=True)
-
-    def _dict_to_tree(
-        self,
-        tree_dict: Dict,
-        parent_path: str,
-        metadata_map: Dict,
-        is_top_level: bool = False,
-    ) -> List[TreeNode]:
-        """Recursively convert nested dict to TreeNode list."""
-        nodes = []
-        for name in sorted(tree_dict.keys()):
-            if name.startswith("_"):
-                continue
-
-            node_data = tree_dict[name]
-            full_path = f"{parent_path}/{name}" if parent_path else name
-            metadata = metadata_map.get(full_path, {})
-
-            folder_node = TreeNode(
-                id=f"folder-{full_path}",
-                name=name,
-                type="folder",
-                is_crate=is_top_level,
-                path=full_path,
-                children=[],
-                description=metadata.get("description"),
-                icon=metadata.get("icon"),
-            )
+            ensure_path(fm_path)
 
-            children_dict = node_data.get("_children", {})
-            if children_dict:
-                folder_node.children.extend(
-                    self._dict_to_tree(
-                        children_dict, full_path, metadata_map, is_top_level=False
-                    )
-                )
+        # Only folder nodes exist so far: sort them by name, then append
+        # documents after the subfolders. One sort by title over all documents
+        # leaves every folder's documents in title order as they are appended.
+        roots.sort(key=lambda n: n.name)
+        for node in node_by_path.values():
+            node.children.sort(key=lambda n: n.name)
 
-            docs = node_data.get("_docs", [])
-            for doc in sorted(docs, key=lambda d: d.title or ""):
-                display_name = (
-                    doc.title if doc.title else f"{doc.repo_name} ({doc.doc_type})"
-                )
-                folder_node.children.append(
-                    TreeNode(
-                        id=doc.id,
-                        name=display_name,
-                        type="document",
-                        path=doc.path,
-                        doc_type=doc.doc_type,
-                    )
+        documents.sort(key=lambda d: d.title or "")
+        for doc in documents:
+            display_name = (
+                doc.title if doc.title else f"{doc.repo_name} ({doc.doc_type})"
+            )
+            node_by_path[doc.path or UNCATEGORIZED_FOLDER].children.append(
+                TreeNode.model_construct(
+                    id=doc.id,
+                    name=display_name,
+                    type="document",
+                    is_crate=False,
+                    doc_type=doc.doc_type,
+                    path=doc.path,
+                    description=None,
+                    icon=None,
+                    children=[],
                 )
+            )
 
-            nodes.append(folder_node)
-        return nodes
+        return roots
@@ -4,6 +4,7 @@ import uuid
 import logging
 from datetime import datetime, timezone
 from typing import Optional, List
+from sqlalchemy import String, case, cast, func, update
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from ..models.generation_job import GenerationJob
@@ -90,7 +91,9 @@ class JobService:
         """
         Claim the oldest queued job for processing.
 
-        Sets status to 'running' and records started_at timestamp.
+        Sets status to 'running' and records started_at timestamp. The row is
+        locked with FOR UPDATE SKIP LOCKED, so concurrent workers each claim a
+        different job instead of racing for the same one.
 
         Returns:
             The claimed job, or None if no queued jobs exist
@@ -99,6 +102,7 @@ class JobService:
             self.db.query(GenerationJob)
             .filter(GenerationJob.status == "queued")
             .order_by(GenerationJob.created_at.asc())
+            .with_for_update(skip_locked=True)
             .first()
         )
         if not job:
@@ -113,15 +117,16 @@ class JobService:
         return job
 
     def complete(self, job_id: str) -> GenerationJob:
-        """Mark a job as successfully completed."""
-        job = self.db.query(GenerationJob).get(job_id)
+        """Mark a job as successfully completed (one UPDATE ... RETURNING)."""
+        job = self.db.execute(
+            update(GenerationJob)
+            .where(GenerationJob.id == job_id)
+            .values(status="completed", completed_at=datetime.now(timezone.utc))
+            .returning(GenerationJob)
+        ).scalar_one_or_none()
         if not job:
             raise ValueError(f"Job not found: {job_id}")
-
-        job.status = "completed"
-        job.completed_at = datetime.now(timezone.utc)
         self.db.commit()
-        self.db.refresh(job)
 
         logger.info(f"Job {job_id} completed successfully")
         return job
@@ -130,33 +135,47 @@ class JobService:
         """
         Mark a job as failed.
 
-        If retry_count < 1, re-queues the job for automatic retry.
+        If retry_count < 1, re-queues the job for automatic retry. The
+        retry-or-give-up decision is made in SQL, so this is a single
+        UPDATE ... RETURNING round-trip.
 
         Args:
             job_id: The job to mark as failed
             error_message: Description of what went wrong
         """
-        job = self.db.query(GenerationJob).get(job_id)
+        retry_count = GenerationJob.retry_count + 1
+        retrying = retry_count <= MAX_RETRIES
+        retry_message = func.ltrim(
+            func.coalesce(GenerationJob.error_message, "")
+            + "\n[retry "
+            + cast(retry_count, String)
+            + "] "
+            + error_message,
+            "\n",
+        )
+        job = self.db.execute(
+            update(GenerationJob)
+            .where(GenerationJob.id == job_id)
+            .values(
+                retry_count=retry_count,
+                status=case((retrying, "queued"), else_="failed"),
+                error_message=case((retrying, retry_message), else_=error_message),
+                completed_at=case(
+                    (retrying, GenerationJob.completed_at),
+                    else_=datetime.now(timezone.utc),
+                ),
+            )
+            .returning(GenerationJob)
+        ).scalar_one_or_none()
         if not job:
             raise ValueError(f"Job not found: {job_id}")
 
-        job.retry_count += 1
-
-        if job.retry_count <= MAX_RETRIES:
-            # Re-queue for retry
-            job.status = "queued"
-            previous = job.error_message or ""
-            job.error_message = f"{previous}\n[retry {job.retry_count}] {error_message}".lstrip("\n")
+        if job.status == "queued":
             logger.info(f"Job {job_id} failed, re-queuing (retry {job.retry_count})")
         else:
-            # Exhausted retries
-            job.status = "failed"
-            job.error_message = error_message
-            job.completed_at = datetime.now(timezone.utc)
             logger.warning(f"Job {job_id} failed permanently: {error_message}")
 
         self.db.commit()
-        self.db.refresh(job)
         return job
 
     def get_jobs_for_repo(self, repo_url: str, limit: int = 10) -> List[GenerationJob]:
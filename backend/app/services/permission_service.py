@@ -10,6 +10,9 @@ Design:
     - A user's grants are a list of (path_prefix, role) pairs
     - The most specific (longest) matching prefix determines the effective role
     - No matching grant = no access
+
+Grants can be passed as the raw list or pre-compiled once with
+``compile_grants()`` when many paths are checked against the same user.
 """
 
 from __future__ import annotations
@@ -27,9 +30,28 @@ _ROLE_ACTIONS: dict[str, set[str]] = {
     "viewer": {"read"},
 }
 
+# Normalized path_prefix -> role. Built by compile_grants().
+CompiledGrants = dict[str, str]
+
+
+def compile_grants(grants: list[FolderGrant] | CompiledGrants) -> CompiledGrants:
+    """Index grants by normalized prefix for repeated role lookups.
+
+    Resolving a path then costs one dict lookup per path segment instead
+    of a scan over every grant. For duplicate prefixes the first grant
+    wins, matching resolve_role() on the raw list. Already-compiled grants
+    are returned unchanged.
+    """
+    if isinstance(grants, dict):
+        return grants
+    compiled: CompiledGrants = {}
+    for grant in grants:
+        compiled.setdefault(grant.path_prefix.strip("/"), grant.role)
+    return compiled
+
 
 def check_permission(
-    grants: list[FolderGrant],
+    grants: list[FolderGrant] | CompiledGrants,
     doc_path: str,
     action: str,
 ) -> bool:
@@ -39,7 +61,8 @@ def check_permission(
     then checks whether the grant's role permits *action*.
 
     Args:
-        grants: The user's folder grants (loaded once per request).
+        grants: The user's folder grants (loaded once per request), or
+            their ``compile_grants()`` form.
         doc_path: The document's ``path`` field (e.g. ``"crate/folder/doc"``).
         action: One of ``"read"``, ``"edit"``, ``"delete"``, ``"admin"``.
 
@@ -52,34 +75,26 @@ def check_permission(
     return action in _ROLE_ACTIONS.get(effective_role, set())
 
 
-def resolve_role(grants: list[FolderGrant], doc_path: str) -> str | None:
+def resolve_role(grants: list[FolderGrant] | CompiledGrants, doc_path: str) -> str | None:
     """Find the effective role for a document path given a set of grants.
 
     Returns the role from the most specific (longest) matching grant,
     or None if no grant matches.
     """
-    best_match_len = -1
-    effective_role: str | None = None
-
-    normalized_path = doc_path.strip("/")
-
-    for grant in grants:
-        prefix = grant.path_prefix.strip("/")
-
-        # Empty prefix = root grant, matches everything
-        if prefix == "":
-            if best_match_len < 0:
-                best_match_len = 0
-                effective_role = grant.role
-            continue
-
-        # Check if document path is under this prefix
-        if normalized_path == prefix or normalized_path.startswith(prefix + "/"):
-            if len(prefix) > best_match_len:
-                best_match_len = len(prefix)
-                effective_role = grant.role
-
-    return effective_role
+    roles = compile_grants(grants)
+    if not roles:
+        return None
+
+    # Walk from the full path up through each ancestor; the first prefix
+    # found is the longest match. The empty prefix (root grant) matches last.
+    path = doc_path.strip("/")
+    while True:
+        if path in roles:
+            return roles[path]
+        cut = path.rfind("/")
+        if cut == -1:
+            return roles.get("")
+        path = path[:cut]
 
 
 def filter_paths_by_grants(
@@ -89,5 +104,16 @@ def filter_paths_by_grants(
 
     Used by repository queries to filter documents server-side.
     An empty string in the result means full access (root grant).
+    Duplicates and prefixes nested under another granted prefix are
+    dropped, since they match nothing extra; the SQL predicate built from
+    the result stays as short as the grant set allows.
     """
-    return [g.path_prefix.strip("/") for g in grants]
+    prefixes = sorted({g.path_prefix.strip("/") for g in grants})
+    if prefixes and prefixes[0] == "":
+        return [""]
+    # Sorted order visits each ancestor before its descendants.
+    roots: list[str] = []
+    for prefix in prefixes:
+        if not any(prefix.startswith(f"{root}/") for root in roots):
+            roots.append(prefix)
+    return roots
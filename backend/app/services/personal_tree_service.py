@@ -34,54 +34,35 @@ class PersonalTreeService:
 
     def get_tree(self, user_id: str = "default") -> List[PersonalTreeNode]:
         """Build the full personal tree for a user."""
-        folders = self.repo.get_folders_by_user(user_id)
-        refs = self.repo.get_refs_by_user(user_id)
-
-        # Load document titles for refs
-        doc_ids = {r.document_id for r in refs}
-        doc_map: Dict[str, str] = {}
-        for doc_id in doc_ids:
-            doc = self.doc_repo.get_by_id_optional(doc_id)
-            if doc:
-                doc_map[doc_id] = doc.title or doc_id
-
-        # Index refs by folder_id
-        refs_by_folder: Dict[str, List[PersonalDocumentRef]] = {}
-        for ref in refs:
-            refs_by_folder.setdefault(ref.folder_id, []).append(ref)
-
-        # Index folders by parent_id
-        children_by_parent: Dict[Optional[str], List[PersonalFolder]] = {}
-        for folder in folders:
-            children_by_parent.setdefault(folder.parent_id, []).append(folder)
-
-        # Recursive build
-        def build_children(parent_id: Optional[str]) -> List[PersonalTreeNode]:
-            nodes: List[PersonalTreeNode] = []
-            for folder in children_by_parent.get(parent_id, []):
-                child_nodes = build_children(folder.folder_id)
-
-                # Add document refs as leaf nodes
-                for ref in refs_by_folder.get(folder.folder_id, []):
-                    title = doc_map.get(ref.document_id, ref.document_id)
-                    child_nodes.append(PersonalTreeNode(
-                        id=ref.ref_id,
-                        name=title,
-                        type="document",
-                        document_id=ref.document_id,
-                        ref_id=ref.ref_id,
-                    ))
-
-                nodes.append(PersonalTreeNode(
-                    id=folder.folder_id,
-                    name=folder.name,
-                    type="folder",
-                    folder_id=folder.folder_id,
-                    children=child_nodes,
+        # Folders and refs (with document titles) arrive in one query.
+        rows = self.repo.load_tree_rows(user_id)
+        folders: Dict[str, PersonalTreeNode] = {
+            row.id: PersonalTreeNode(id=row.id, name=row.name, type="folder", folder_id=row.id)
+            for row in rows
+            if row.kind == "f"
+        }
+
+        # Attach each node to its parent in one pass. Folder rows precede
+        # ref rows, so every folder lists its subfolders before its refs,
+        # each in display order. Nodes whose parent is not in the user's
+        # tree are unreachable and dropped.
+        roots: List[PersonalTreeNode] = []
+        for row in rows:
+            if row.kind == "f":
+                node = folders[row.id]
+                if row.parent_id is None:
+                    roots.append(node)
+                elif row.parent_id in folders:
+                    folders[row.parent_id].children.append(node)
+            elif row.parent_id in folders:
+                folders[row.parent_id].children.append(PersonalTreeNode(
+                    id=row.id,
+                    name=row.title or row.document_id,
+                    type="document",
+                    document_id=row.document_id,
+                    ref_id=row.id,
                 ))
-            return nodes
-
-        return build_children(None)
+        return roots
 
     def create_folder(self, user_id: str, name: str, parent_id: Optional[str] = None) -> PersonalFolder:
         """Create a personal folder. Validates parent exists if provided."""
@@ -174,11 +155,5 @@ class PersonalTreeService:
         return result
 
     def _is_descendant(self, ancestor_id: str, candidate_id: str) -> bool:
-        """Check if candidate_id is a descendant of ancestor_id."""
-        if ancestor_id == candidate_id:
-            return True
-        children = self.repo.get_children(ancestor_id)
-        for child in children:
-            if self._is_descendant(child.folder_id, candidate_id):
-                return True
-        return False
+        """Check if candidate_id is ancestor_id itself or one of its descendants."""
+        return ancestor_id == candidate_id or self.repo.is_descendant(ancestor_id, candidate_id)
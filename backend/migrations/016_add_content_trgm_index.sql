@@ -0,0 +1,11 @@
+-- dialect: postgresql
+-- Migration 016: Trigram index on document content for substring lookups.
+-- update_incoming_dependencies() finds documents containing "[[<title>]]"
+-- with LIKE '%...%', which otherwise seq-scans every document's content.
+-- A pg_trgm GIN index lets PostgreSQL answer unanchored LIKE with an index scan.
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS idx_documents_content_trgm ON documents
+USING GIN (content gin_trgm_ops)
+WHERE deleted_at IS NULL;
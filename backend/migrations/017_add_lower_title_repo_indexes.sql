@@ -0,0 +1,10 @@
+-- Migration 017: Expression indexes for case-insensitive wikilink resolution.
+-- Idempotent (IF NOT EXISTS).
+
+-- _resolve_wikilinks_batch() filters on lower(title) / lower(repo_name) for
+-- active documents. The plain indexes from migration 014 can't serve lower(),
+-- so without these every resolution scans the documents table.
+CREATE INDEX IF NOT EXISTS ix_documents_title_lower
+ON documents (lower(title)) WHERE deleted_at IS NULL;
+CREATE INDEX IF NOT EXISTS ix_documents_repo_name_lower
+ON documents (lower(repo_name)) WHERE deleted_at IS NULL;
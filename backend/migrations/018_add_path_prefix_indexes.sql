@@ -0,0 +1,12 @@
+-- dialect: postgresql
+-- Migration 018: Prefix-match indexes for folder path lookups.
+-- Idempotent (IF NOT EXISTS).
+
+-- Folder existence checks, moves and deletes filter on
+-- path = :p OR path LIKE ':p/%'. Under a non-C collation the plain btree
+-- indexes on path cannot serve the anchored LIKE; text_pattern_ops can.
+-- The documents index is partial because only active rows are ever matched.
+CREATE INDEX IF NOT EXISTS ix_documents_active_path_pattern
+ON documents (path text_pattern_ops) WHERE deleted_at IS NULL;
+CREATE INDEX IF NOT EXISTS ix_folder_metadata_path_pattern
+ON folder_metadata (path text_pattern_ops);
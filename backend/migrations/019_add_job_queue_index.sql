@@ -0,0 +1,9 @@
+-- dialect: postgresql
+-- Migration 019: Partial index for claiming the oldest queued job.
+-- claim_next() filters status = 'queued' and orders by created_at; this index
+-- returns the head of the queue without scanning completed/failed history.
+-- Idempotent (IF NOT EXISTS).
+
+CREATE INDEX IF NOT EXISTS ix_generation_jobs_queued
+ON generation_jobs(created_at)
+WHERE status = 'queued';
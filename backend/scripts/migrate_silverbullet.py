@@ -14,13 +14,29 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from app.database import SessionLocal, Base, engine
 from app.models import Document, Version, Dependency
-from app.repositories import DocumentRepository, VersionRepository, DependencyRepository
+
+# Compiled once: every file runs through these, most of them twice
+# (live note + history versions).
+_BOTTOMATTER_RE = re.compile(r'\n---\n((?:[^\n]+:[^\n]+\n?)+)---\s*$')
+_FRONTMATTER_END_RE = re.compile(r'\n---\n')
+_WIKILINK_RE = re.compile(r'\[\[([^\]|]+)(?:\|[^\]]*)?\]\]')
+
+# Rows per bulk insert + commit.
+BATCH_SIZE = 500
+
+
+def _insert_batches(db_session, *batches):
+    """Bulk-insert each (model, rows) pair in order, commit, and clear the rows."""
+    for model, rows in batches:
+        if rows:
+            db_session.bulk_insert_mappings(model, rows)
+            rows.clear()
+    db_session.commit()
 
 
 def parse_bottomatter(content: str) -> tuple[dict | None, str]:
     """Parse YAML bottom matter from markdown content."""
-    pattern = r'\n---\n((?:[^\n]+:[^\n]+\n?)+)---\s*$'
-    match = re.search(pattern, content)
+    match = _BOTTOMATTER_RE.search(content)
 
     if not match:
         return None, content
@@ -43,11 +59,12 @@ def parse_frontmatter(content: str) -> tuple[dict | None, str]:
     if not content.startswith("---\n"):
         return None, content
 
-    end_match = re.search(r'\n---\n', content[4:])
+    # Search from offset 4 in place rather than slicing a copy of the file.
+    end_match = _FRONTMATTER_END_RE.search(content, 4)
     if not end_match:
         return None, content
 
-    end_pos = end_match.end() + 4
+    end_pos = end_match.end()
     frontmatter_text = content[4:end_pos-4]
     body = content[end_pos:]
 
@@ -63,9 +80,7 @@ def parse_frontmatter(content: str) -> tuple[dict | None, str]:
 
 def extract_wikilinks(content: str) -> list[str]:
     """Extract wikilinks from content: [[page-name]] or [[page-name|display]]."""
-    pattern = r'\[\[([^\]|]+)(?:\|[^\]]*)?\]\]'
-    matches = re.findall(pattern, content)
-    return matches
+    return _WIKILINK_RE.findall(content)
 
 
 def generate_doc_id(repo_url: str, doc_type: str) -> str:
@@ -80,9 +95,6 @@ def migrate_documents(notes_dir: Path, db_session):
     print("MIGRATING DOCUMENTS FROM SILVERBULLET")
     print(f"{'='*70}\n")
 
-    doc_repo = DocumentRepository(db_session)
-    version_repo = VersionRepository(db_session)
-
     # Track for dependency linking
     doc_id_to_filename = {}
     wikilinks_by_doc = {}
@@ -94,6 +106,15 @@ def migrate_documents(notes_dir: Path, db_session):
     migrated_count = 0
     skipped_count = 0
 
+    # Load every existing ID (soft-deleted rows included, since they still
+    # hold the primary key) once instead of querying per file.
+    existing_ids = {doc_id for (doc_id,) in db_session.query(Document.id)}
+
+    # Rows are collected as plain dicts and bulk-inserted, documents first
+    # so their versions' foreign keys resolve.
+    docs_batch: list[dict] = []
+    versions_batch: list[dict] = []
+
     for md_file in md_files:
         # Skip system files
         if md_file.name.startswith(('.', 'CONFIG', 'SETTINGS', 'PLUGS', 'index')):
@@ -129,32 +150,30 @@ def migrate_documents(notes_dir: Path, db_session):
             content_preview = body[:500] if len(body) > 500 else body
 
             # Check if already exists
-            existing = doc_repo.get_by_id_optional(doc_id)
-            if existing:
+            if doc_id in existing_ids:
                 print(f"[Exists] {doc_id} - Skipping duplicate")
                 skipped_count += 1
                 continue
 
             # Create document
-            document = Document(
+            document = dict(
                 id=doc_id,
                 repo_url=repo_url,
                 repo_name=repo_name,
                 doc_type=doc_type,
-                collection=metadata.get('collection', ''),
+                title=metadata.get('title', md_file.stem),
                 content=body,
                 content_preview=content_preview,
                 generation_count=1,
                 created_at=datetime.fromisoformat(metadata.get('generated_at', datetime.utcnow().isoformat())),
                 updated_at=datetime.utcnow()
             )
-            db_session.add(document)
 
             # Create initial version
             version_id = f"{doc_id}-{datetime.utcnow().isoformat().replace(':', '-').replace('.', '-')}"
             content_hash = hashlib.sha256(body.encode()).hexdigest()
 
-            version = Version(
+            version = dict(
                 version_id=version_id,
                 doc_id=doc_id,
                 content=body,
@@ -167,7 +186,9 @@ def migrate_documents(notes_dir: Path, db_session):
                 },
                 created_at=datetime.fromisoformat(metadata.get('generated_at', datetime.utcnow().isoformat()))
             )
-            db_session.add(version)
+            docs_batch.append(document)
+            versions_batch.append(version)
+            existing_ids.add(doc_id)
 
             # Track wikilinks for later dependency creation
             wikilinks = extract_wikilinks(content)
@@ -180,17 +201,17 @@ def migrate_documents(notes_dir: Path, db_session):
             print(f"[Migrate] {doc_id} ({doc_type}) - {repo_name}")
             migrated_count += 1
 
-            # Commit periodically
-            if migrated_count % 10 == 0:
-                db_session.commit()
+            # Insert and commit periodically
+            if len(docs_batch) >= BATCH_SIZE:
+                _insert_batches(db_session, (Document, docs_batch), (Version, versions_batch))
 
         except Exception as e:
             print(f"[Error] {md_file.name} - {str(e)}")
             skipped_count += 1
             continue
 
-    # Final commit
-    db_session.commit()
+    # Final batch
+    _insert_batches(db_session, (Document, docs_batch), (Version, versions_batch))
 
     print(f"\n[Summary] Migrated: {migrated_count}, Skipped: {skipped_count}")
 
@@ -209,6 +230,7 @@ def migrate_version_history(notes_dir: Path, doc_id_to_filename: dict, db_sessio
         return
 
     version_count = 0
+    versions_batch: list[dict] = []
 
     for doc_dir in history_dir.iterdir():
         if not doc_dir.is_dir():
@@ -243,7 +265,7 @@ def migrate_version_history(notes_dir: Path, doc_id_to_filename: dict, db_sessio
                 version_id = f"{doc_id}-{timestamp_str}"
                 content_hash = hashlib.sha256(body.encode()).hexdigest()
 
-                version = Version(
+                versions_batch.append(dict(
                     version_id=version_id,
                     doc_id=doc_id,
                     content=body,
@@ -251,18 +273,17 @@ def migrate_version_history(notes_dir: Path, doc_id_to_filename: dict, db_sessio
                     author_type='ai',  # Historical assumption
                     author_metadata=metadata if metadata else {},
                     created_at=datetime.fromisoformat(iso_timestamp)
-                )
-                db_session.add(version)
+                ))
                 version_count += 1
 
-                if version_count % 20 == 0:
-                    db_session.commit()
+                if len(versions_batch) >= BATCH_SIZE:
+                    _insert_batches(db_session, (Version, versions_batch))
 
             except Exception as e:
                 print(f"[Error] {version_file.name} - {str(e)}")
                 continue
 
-    db_session.commit()
+    _insert_batches(db_session, (Version, versions_batch))
     print(f"[Summary] Migrated {version_count} historical versions")
 
 
@@ -272,8 +293,13 @@ def create_dependencies(wikilinks_by_doc: dict, doc_id_to_filename: dict, db_ses
     print("CREATING DEPENDENCY LINKS")
     print(f"{'='*70}\n")
 
-    dep_repo = DependencyRepository(db_session)
     dependency_count = 0
+    dependencies_batch: list[dict] = []
+    # (from_doc_id, to_doc_id) pairs are unique (ix_dependencies_pair), but
+    # [[x]], [[x|alias]] and [[dir/x]] in one note all resolve to the same
+    # pair. Skip repeats so no batch hits the constraint mid-run, after
+    # earlier batches are already committed.
+    seen_pairs: set[tuple[str, str]] = set()
 
     # Create reverse lookup (filename -> doc_id)
     filename_to_doc_id = {v: k for k, v in doc_id_to_filename.items()}
@@ -288,20 +314,20 @@ def create_dependencies(wikilinks_by_doc: dict, doc_id_to_filename: dict, db_ses
             # Try exact match
             to_doc_id = filename_to_doc_id.get(link_name)
 
-            if to_doc_id:
-                try:
-                    dependency = Dependency(
-                        from_doc_id=from_doc_id,
-                        to_doc_id=to_doc_id,
-                        link_type='wikilink',
-                        link_text=link
-                    )
-                    db_session.add(dependency)
-                    dependency_count += 1
-                except Exception as e:
-                    print(f"[Error] Failed to create dependency {from_doc_id} -> {to_doc_id}: {e}")
+            if to_doc_id and (from_doc_id, to_doc_id) not in seen_pairs:
+                seen_pairs.add((from_doc_id, to_doc_id))
+                dependencies_batch.append(dict(
+                    from_doc_id=from_doc_id,
+                    to_doc_id=to_doc_id,
+                    link_type='wikilink',
+                    link_text=link
+                ))
+                dependency_count += 1
 
-    db_session.commit()
+                if len(dependencies_batch) >= BATCH_SIZE:
+                    _insert_batches(db_session, (Dependency, dependencies_batch))
+
+    _insert_batches(db_session, (Dependency, dependencies_batch))
     print(f"[Summary] Created {dependency_count} dependency links")
 
 
@@ -142,6 +142,39 @@ class TestCircularDependencies:
         )
         assert resp.status_code == 400
 
+    def test_non_wikilink_transitive_cycle_rejected(self, client):
+        """A→B→C then C→A closes a cycle through B and is rejected."""
+        ids = [
+            client.post("/api/docs", json=make_document(title=f"Chain {n}", path=f"crate/chain{n}")).json()["id"]
+            for n in "abc"
+        ]
+        a_id, b_id, c_id = ids
+        for src, dst in ((a_id, b_id), (b_id, c_id)):
+            resp = client.post(
+                f"/api/docs/{src}/dependencies",
+                json={"from_doc_id": src, "to_doc_id": dst, "link_type": "import"},
+            )
+            assert resp.status_code == 201
+
+        resp = client.post(
+            f"/api/docs/{c_id}/dependencies",
+            json={"from_doc_id": c_id, "to_doc_id": a_id, "link_type": "import"},
+        )
+        assert resp.status_code == 400
+
+    def test_non_wikilink_dag_allowed(self, client):
+        """Diamond A→B, A→C, B→D, C→D has no cycle; every edge is accepted."""
+        ids = {
+            n: client.post("/api/docs", json=make_document(title=f"Dag {n}", path=f"crate/dag{n}")).json()["id"]
+            for n in "abcd"
+        }
+        for src, dst in (("a", "b"), ("a", "c"), ("b", "d"), ("c", "d"), ("a", "d")):
+            resp = client.post(
+                f"/api/docs/{ids[src]}/dependencies",
+                json={"from_doc_id": ids[src], "to_doc_id": ids[dst], "link_type": "import"},
+            )
+            assert resp.status_code == 201
+
 
 class TestDependencyRefresh:
 
@@ -0,0 +1,142 @@
+"""Unit tests for DependencyService — wikilink diffing and link retargeting on move."""
+
+from unittest.mock import patch
+
+from app.models import Dependency, Document
+from app.schemas.dependency import DependencyCreate
+from app.schemas.document import DocumentCreate
+from app.services.dependency_service import DependencyService
+from app.services.document_service import DocumentService
+
+
+def _create_doc(db, title: str, repo_name: str, content: str = "No links.") -> str:
+    doc, _ = DocumentService(db).create_or_update_document(
+        DocumentCreate(
+            title=title,
+            path="crate/deps",
+            content=content,
+            repo_url=f"https://github.com/org/{repo_name}",
+            repo_name=repo_name,
+            author_type="human",
+        )
+    )
+    return doc.id
+
+
+def _outgoing(db, doc_id: str) -> dict[str, tuple[int, str, str]]:
+    """to_doc_id -> (row id, link_type, link_text) for every outgoing edge."""
+    db.expire_all()
+    rows = db.query(Dependency).filter(Dependency.from_doc_id == doc_id).all()
+    return {r.to_doc_id: (r.id, r.link_type, r.link_text) for r in rows}
+
+
+class TestReplaceDocumentDependencies:
+
+    def test_unchanged_links_are_not_rewritten(self, db):
+        b = _create_doc(db, "Bee", "bee-repo")
+        c = _create_doc(db, "Sea", "sea-repo")
+        content = "Links [[bee-repo]] and [[Sea]]."
+        a = _create_doc(db, "Ay", "ay-repo", content)
+        before = _outgoing(db, a)
+        assert set(before) == {b, c}
+
+        svc = DependencyService(db)
+        with patch.object(svc.dep_repo, "create_wikilinks", wraps=svc.dep_repo.create_wikilinks) as create:
+            assert svc.replace_document_dependencies(a, content) == []
+        db.commit()
+
+        create.assert_called_once_with(a, {})
+        assert _outgoing(db, a) == before
+
+    def test_changed_link_text_replaces_row(self, db):
+        b = _create_doc(db, "Bee", "bee-repo")
+        a = _create_doc(db, "Ay", "ay-repo", "See [[bee-repo]].")
+        old_id, _, old_text = _outgoing(db, a)[b]
+        assert old_text == "bee-repo"
+
+        svc = DependencyService(db)
+        svc.replace_document_dependencies(a, "See [[Bee|the bee doc]].")
+        db.commit()
+
+        new_id, link_type, new_text = _outgoing(db, a)[b]
+        assert (link_type, new_text) == ("wikilink", "Bee")
+        assert new_id != old_id
+
+    def test_removed_link_deletes_only_that_row(self, db):
+        b = _create_doc(db, "Bee", "bee-repo")
+        c = _create_doc(db, "Sea", "sea-repo")
+        a = _create_doc(db, "Ay", "ay-repo", "[[Bee]] and [[Sea]]")
+        kept = _outgoing(db, a)[b]
+
+        svc = DependencyService(db)
+        svc.replace_document_dependencies(a, "Only [[Bee]] now.")
+        db.commit()
+
+        assert _outgoing(db, a) == {b: kept}
+
+        svc.replace_document_dependencies(a, "No links at all.")
+        db.commit()
+        assert _outgoing(db, a) == {}
+
+    def test_manual_dependencies_are_dropped_on_rebuild(self, db):
+        """Outgoing non-wikilink edges are replaced, as delete-and-reinsert did."""
+        b = _create_doc(db, "Bee", "bee-repo")
+        c = _create_doc(db, "Sea", "sea-repo")
+        a = _create_doc(db, "Ay", "ay-repo", "[[Bee]]")
+
+        svc = DependencyService(db)
+        svc.create_dependency(DependencyCreate(from_doc_id=a, to_doc_id=c, link_type="import"))
+        db.commit()
+        assert _outgoing(db, a)[c][1] == "import"
+
+        svc.replace_document_dependencies(a, "[[Bee]]")
+        db.commit()
+        assert set(_outgoing(db, a)) == {b}
+
+        svc.create_dependency(DependencyCreate(from_doc_id=a, to_doc_id=c, link_type="import"))
+        db.commit()
+        svc.replace_document_dependencies(a, "No links.")
+        db.commit()
+        assert _outgoing(db, a) == {}
+
+
+class TestUpdateWikilinksOnMove:
+
+    def _moved(self, db) -> tuple[str, str, int]:
+        """Target renamed from old-crate to new-crate, linked from one referrer."""
+        target = _create_doc(db, "Target Title", "old-crate")
+        referrer = _create_doc(db, "Referrer", "ref-repo", "See [[old-crate]].")
+        dep_id = _outgoing(db, referrer)[target][0]
+
+        db.query(Document).filter(Document.id == target).update({Document.repo_name: "new-crate"})
+        db.flush()
+        return target, referrer, dep_id
+
+    def test_link_text_retargeted_when_moved_doc_still_resolves(self, db):
+        target, referrer, dep_id = self._moved(db)
+
+        svc = DependencyService(db)
+        with patch.object(svc, "replace_document_dependencies") as rebuild:
+            assert svc.update_wikilinks_on_move(target, "old-crate", "new-crate") == 1
+        db.commit()
+
+        rebuild.assert_not_called()
+        assert db.get(Document, referrer).content == "See [[new-crate]]."
+        assert _outgoing(db, referrer) == {target: (dep_id, "wikilink", "new-crate")}
+
+    def test_full_rebuild_when_new_name_resolves_elsewhere(self, db):
+        target, referrer, _ = self._moved(db)
+        # An exact title match outranks the moved document's repo_name
+        other = _create_doc(db, "new-crate", "other-repo")
+
+        svc = DependencyService(db)
+        with patch.object(
+            svc, "replace_document_dependencies", wraps=svc.replace_document_dependencies,
+        ) as rebuild:
+            assert svc.update_wikilinks_on_move(target, "old-crate", "new-crate") == 1
+        db.commit()
+
+        rebuild.assert_called_once()
+        edges = _outgoing(db, referrer)
+        assert set(edges) == {other}
+        assert edges[other][2] == "new-crate"
@@ -6,9 +6,12 @@ version creation, batch operations, and move logic.
 """
 
 import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+from app.models import Document
 from app.services.document_service import DocumentService
 from app.schemas.document import DocumentCreate, DocumentUpdate, BatchParams
-from app.exceptions import DocumentNotFoundError, ConflictError
+from app.exceptions import DocumentNotFoundError, ConflictError, ValidationError
 
 
 def _make_create(
@@ -105,6 +108,25 @@ class TestCreateOrUpdate:
         versions = svc.get_document_versions(doc.id)
         assert len(versions) == 2
 
+    def test_upsert_unchanged_content_is_noop(self, db):
+        svc = DocumentService(db)
+        doc, _ = svc.create_or_update_document(_make_create())
+        again, is_new = svc.create_or_update_document(_make_create())
+        assert is_new is False
+        assert again.id == doc.id
+        assert again.generation_count == 1
+        assert len(svc.get_document_versions(doc.id)) == 1
+
+    def test_bulk_upsert_creates_one_version_per_document(self, db):
+        svc = DocumentService(db)
+        results = svc.create_or_update_documents([
+            _make_create(title="Bulk A"),
+            _make_create(title="Bulk B"),
+        ])
+        assert [is_new for _, is_new in results] == [True, True]
+        for doc, _ in results:
+            assert len(svc.get_document_versions(doc.id)) == 1
+
     def test_content_preview_generated(self, db):
         svc = DocumentService(db)
         doc, _ = svc.create_or_update_document(_make_create(content="Short content"))
@@ -157,6 +179,18 @@ class TestUpdateDocument:
                 DocumentUpdate(content="v3", author_type="human", version=stale_version),
             )
 
+    def test_unchanged_content_skips_dependency_refresh(self, db):
+        svc, doc = self._create(db)
+        with patch.object(svc.dep_service, "replace_document_dependencies") as refresh:
+            svc.update_document(
+                doc.id, DocumentUpdate(content=doc.content, author_type="human")
+            )
+            refresh.assert_not_called()
+            svc.update_document(
+                doc.id, DocumentUpdate(content="Changed", author_type="human")
+            )
+            refresh.assert_called_once()
+
     def test_update_nonexistent_raises(self, db):
         svc = DocumentService(db)
         with pytest.raises(DocumentNotFoundError):
@@ -208,6 +242,34 @@ class TestDeleteRestore:
         svc.permanent_delete_document(doc.id)
         svc.permanent_delete_document(doc.id)  # no error
 
+    def test_purge_expired_trash_in_chunks(self, db):
+        svc = DocumentService(db)
+        now = datetime.now(timezone.utc)
+        deleted_at = {
+            "expired-0": now - timedelta(days=40),
+            "expired-1": now - timedelta(days=35),
+            "expired-2": now - timedelta(days=31),
+            "recent": now - timedelta(days=1),
+            "active": None,
+        }
+        ids = {}
+        for name, when in deleted_at.items():
+            doc, _ = svc.create_or_update_document(_make_create(title=name, path=f"crate/{name}"))
+            ids[name] = doc.id
+            if when is not None:
+                db.query(Document).filter(Document.id == doc.id).update({Document.deleted_at: when})
+        db.commit()
+
+        with patch.object(DocumentService, "PURGE_CHUNK_SIZE", 1), \
+                patch.object(svc.doc_repo, "purge_expired", wraps=svc.doc_repo.purge_expired) as purge:
+            assert svc.purge_expired_trash(days=30) == 3
+
+        # One call per expired document, plus the one that finds nothing left
+        assert purge.call_count == 4
+        db.expire_all()
+        remaining = {d.id for d in db.query(Document.id)}
+        assert remaining == {ids["recent"], ids["active"]}
+
 
 class TestMoveDocument:
     """Move document to different folder path."""
@@ -254,6 +316,14 @@ class TestBatchOperations:
         assert result.succeeded == 3
         assert result.failed == 0
 
+    def test_batch_delete_reports_unknown_ids(self, db):
+        svc, docs = self._create_docs(db)
+        svc.delete_document(docs[1].id)
+        ids = [docs[0].id, docs[1].id, "nonexistent-id"]
+        result = svc.execute_batch("delete", ids, BatchParams())
+        assert result.succeeded == 2
+        assert [e.doc_id for e in result.errors] == ["nonexistent-id"]
+
     def test_batch_move(self, db):
         svc, docs = self._create_docs(db)
         ids = [d.id for d in docs]
@@ -273,6 +343,13 @@ class TestBatchOperations:
         doc = svc.get_document(ids[0])
         assert "Architecture" in doc.keywords
 
+    def test_batch_keywords_reports_missing_docs(self, db):
+        svc, docs = self._create_docs(db)
+        ids = [docs[0].id, "nonexistent-id"]
+        result = svc.execute_batch("remove_keywords", ids, BatchParams(keywords=["API"]))
+        assert result.succeeded == 1
+        assert result.errors[0].doc_id == "nonexistent-id"
+
     def test_batch_unknown_operation(self, db):
         svc, docs = self._create_docs(db)
         result = svc.execute_batch("explode", [docs[0].id], BatchParams())
@@ -287,6 +364,35 @@ class TestBatchOperations:
         assert result.failed == 1
         assert len(result.errors) == 1
 
+    def test_batch_move_failure_rolls_back_only_that_document(self, db):
+        svc, docs = self._create_docs(db)
+        ids = [docs[0].id, docs[1].id, "nonexistent-id", docs[2].id]
+        move = svc._move_normalized
+
+        def flaky_move(doc_id, target_path):
+            if doc_id == docs[1].id:
+                raise ValidationError("cannot move this one")
+            return move(doc_id, target_path)
+
+        with patch.object(svc, "_move_normalized", side_effect=flaky_move):
+            result = svc.execute_batch("move", ids, BatchParams(target_path="new/path"))
+
+        assert (result.total, result.succeeded, result.failed) == (4, 2, 2)
+        assert [(e.doc_id, e.error) for e in result.errors] == [
+            (docs[1].id, "cannot move this one"),
+            ("nonexistent-id", str(DocumentNotFoundError("nonexistent-id"))),
+        ]
+        db.expire_all()
+        assert svc.get_document(docs[0].id).path == "new/path"
+        assert svc.get_document(docs[1].id).path == "crate/batch1"
+        assert svc.get_document(docs[2].id).path == "new/path"
+
+    def test_batch_duplicate_ids_counted_once(self, db):
+        svc, docs = self._create_docs(db)
+        result = svc.execute_batch("delete", [docs[0].id, docs[0].id], BatchParams())
+        assert result.total == 1
+        assert result.succeeded == 1
+
     def test_batch_empty_ids(self, db):
         svc = DocumentService(db)
         result = svc.execute_batch("delete", [], BatchParams())
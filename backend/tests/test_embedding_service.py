@@ -10,8 +10,9 @@ isolation from any EMBEDDING_MODEL in the real environment.
 
 from unittest.mock import patch, MagicMock
 import pytest
+from sqlalchemy import text
 
-from app.services.embedding_service import EmbeddingService
+from app.services.embedding_service import EmbeddingService, clear_query_cache
 from app.schemas.document import DocumentCreate
 from app.services.document_service import DocumentService
 
@@ -32,6 +33,13 @@ def _create_doc(db, title="Test Doc", description="A document about testing.", p
     return doc
 
 
+@pytest.fixture(autouse=True)
+def _empty_query_cache():
+    clear_query_cache()
+    yield
+    clear_query_cache()
+
+
 def _unconfigured_settings():
     """Return a patch that disables embedding configuration."""
     return patch("app.services.embedding_service.settings", embedding_model="", embedding_api_key=None, embedding_api_base=None, embedding_dimensions=None)
@@ -133,6 +141,40 @@ class TestFindSimilar:
             result = svc.find_similar("test query")
         assert result == []
 
+    @patch("app.services.embedding_service.settings")
+    def test_repeated_query_calls_provider_once(self, mock_settings, db):
+        mock_settings.embedding_model = "text-embedding-3-small"
+        mock_settings.embedding_api_key = "key"
+        mock_settings.embedding_api_base = None
+        mock_settings.embedding_dimensions = None
+
+        svc = EmbeddingService(db)
+        with patch.object(EmbeddingService, "generate_embedding", return_value=[0.5, 0.25]) as gen, \
+                patch.object(svc.doc_repo, "search_by_vector", return_value=[]) as search:
+            svc.find_similar("same query")
+            svc.find_similar("same query")
+            svc.find_similar("other query")
+
+        assert gen.call_count == 2
+        assert search.call_args_list[0].kwargs["query_embedding"] == [0.5, 0.25]
+        assert search.call_args_list[1].kwargs["query_embedding"] == [0.5, 0.25]
+
+    @patch("app.services.embedding_service.settings")
+    def test_failed_query_embedding_is_not_cached(self, mock_settings, db):
+        mock_settings.embedding_model = "text-embedding-3-small"
+        mock_settings.embedding_api_key = "key"
+        mock_settings.embedding_api_base = None
+        mock_settings.embedding_dimensions = None
+
+        svc = EmbeddingService(db)
+        with patch.object(EmbeddingService, "generate_embedding", side_effect=[None, [0.5]]) as gen, \
+                patch.object(svc.doc_repo, "search_by_vector", return_value=[]) as search:
+            assert svc.find_similar("flaky query") == []
+            svc.find_similar("flaky query")
+
+        assert gen.call_count == 2
+        search.assert_called_once()
+
 
 class TestGenerateEmbeddingsBatch:
     """Batch embedding generation."""
@@ -180,3 +222,66 @@ class TestGenerateEmbeddingsBatch:
             ):
                 result = EmbeddingService.generate_embeddings_batch(["a", "b"])
         assert result == [[0.1], [0.2]]
+
+
+@pytest.fixture()
+def embedding_column(db):
+    """Ensure the pgvector column exists.
+
+    Fresh test databases are created from the models, which do not declare
+    description_embedding (added by migration 012).
+    """
+    db.execute(text(
+        "ALTER TABLE documents ADD COLUMN IF NOT EXISTS description_embedding vector(1536)"
+    ))
+    db.commit()
+
+
+class TestReindexAll:
+    """Bulk re-embedding with concurrent provider calls."""
+
+    @patch("app.services.embedding_service.settings")
+    def test_each_result_written_to_its_document(self, mock_settings, db, embedding_column):
+        mock_settings.embedding_model = "test-model"
+        mock_settings.embedding_parallelism = 2
+
+        docs = {
+            _create_doc(db, title=f"Reindex {i}", description=f"desc {i}", path=f"crate/re{i}").id: f"desc {i}"
+            for i in range(7)
+        }
+        db.commit()
+
+        def vector_for(text):
+            # pgvector column is vector(1536); the first component identifies the text
+            return [float(text.split()[-1]) + 1.0] + [0.0] * 1535
+
+        skipped = []
+
+        def fake_batch(texts):
+            # The middle entry of every batch fails
+            results = [vector_for(t) for t in texts]
+            if len(texts) >= 3:
+                skipped.append(texts[1])
+                results[1] = None
+            return results
+
+        svc = EmbeddingService(db)
+        with patch.object(EmbeddingService, "REINDEX_BATCH_SIZE", 3), \
+                patch.object(EmbeddingService, "generate_embeddings_batch", side_effect=fake_batch):
+            count = svc.reindex_all()
+
+        assert len(skipped) == 2
+        assert count == len(docs) - len(skipped)
+
+        rows = db.execute(text(
+            "SELECT id, description_embedding::text, embedding_model FROM documents"
+        )).all()
+        assert {row[0] for row in rows} == set(docs)
+        for doc_id, embedding, model in rows:
+            description = docs[doc_id]
+            if description in skipped:
+                assert (embedding, model) == (None, None)
+            else:
+                assert model == "test-model"
+                first = float(embedding.strip("[]").split(",")[0])
+                assert first == vector_for(description)[0]
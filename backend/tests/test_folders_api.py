@@ -17,6 +17,44 @@ class TestTree:
         # There should be at least one node
         assert len(tree) >= 1
 
+    def test_tree_shape_and_ordering(self, client):
+        """Subfolders by name, then documents by title; '_' folders hidden."""
+        ids = {}
+        for path, title in (
+            ("treetest", "Aardvark"),
+            ("treetest/beta", "Zed"),
+            ("treetest/beta", "Alpha"),
+            ("treetest/alpha/deep", "Deep"),
+            ("treetest/_drafts", "Draft"),
+            ("treetest/alpha/_private/x", "Secret"),
+            ("_hidden", "Hidden"),
+        ):
+            ids[title] = client.post("/api/docs", json=make_document(path=path, title=title)).json()["id"]
+        client.post("/api/folders/metadata", json={"path": "treetest/gamma", "description": "Empty"})
+
+        def shape(nodes):
+            return [
+                (n["name"], n["type"], shape(n["children"])) if n["type"] == "folder" else (n["name"], n["type"])
+                for n in nodes
+            ]
+
+        tree = client.get("/api/tree").json()
+        assert "_hidden" not in [n["name"] for n in tree]
+        crate = next(n for n in tree if n["name"] == "treetest")
+        assert (crate["id"], crate["path"], crate["is_crate"]) == ("folder-treetest", "treetest", True)
+        assert shape(crate["children"]) == [
+            ("alpha", "folder", [("deep", "folder", [("Deep", "document")])]),
+            ("beta", "folder", [("Alpha", "document"), ("Zed", "document")]),
+            ("gamma", "folder", []),
+            ("Aardvark", "document"),
+        ]
+
+        alpha = crate["children"][0]
+        assert (alpha["path"], alpha["is_crate"]) == ("treetest/alpha", False)
+        assert crate["children"][2]["description"] == "Empty"
+        deep_doc = alpha["children"][0]["children"][0]
+        assert (deep_doc["id"], deep_doc["path"]) == (ids["Deep"], "treetest/alpha/deep")
+
 
 class TestFolderMetadata:
 
@@ -33,3 +71,23 @@ class TestFolderMetadata:
         client.post("/api/folders/metadata", json={"path": "dup-folder"})
         resp = client.post("/api/folders/metadata", json={"path": "dup-folder"})
         assert resp.status_code == 409
+
+
+class TestFolderOperations:
+
+    def test_move_returns_tree_by_default(self, client):
+        client.post("/api/docs", json=make_document(path="crate-a/old", title="Page"))
+        resp = client.put("/api/folders/move", json={"source_path": "crate-a/old", "target_path": "crate-a/new"})
+        assert resp.status_code == 200
+        assert resp.json()["affected_documents"] == 1
+        assert resp.json()["tree"]
+
+    def test_move_can_skip_tree(self, client):
+        client.post("/api/docs", json=make_document(path="crate-a/old", title="Page"))
+        resp = client.put(
+            "/api/folders/move?include_tree=false",
+            json={"source_path": "crate-a/old", "target_path": "crate-a/new"},
+        )
+        assert resp.status_code == 200
+        assert resp.json()["affected_documents"] == 1
+        assert resp.json()["tree"] == []
@@ -0,0 +1,100 @@
+"""Tests for grant-scoped reads — list, tree, dependencies and search."""
+
+import pytest
+
+from app.core.auth import AuthContext, optional_auth, require_auth
+from app.main import app
+from app.models.user import FolderGrant
+from tests.conftest import make_document
+
+
+def _restrict(*pairs: tuple[str, str]) -> None:
+    """Serve every request as a viewer holding only the given grants."""
+    ctx = AuthContext(
+        user_id="restricted",
+        role="viewer",
+        grants=[FolderGrant(path_prefix=prefix, role=role) for prefix, role in pairs],
+    )
+    app.dependency_overrides[optional_auth] = lambda: ctx
+    app.dependency_overrides[require_auth] = lambda: ctx
+
+
+def _tree_doc_ids(nodes: list[dict]) -> set[str]:
+    ids = set()
+    for node in nodes:
+        if node["type"] == "document":
+            ids.add(node["id"])
+        ids |= _tree_doc_ids(node["children"])
+    return ids
+
+
+@pytest.fixture()
+def docs(client) -> dict[str, str]:
+    """Linked documents under 'a', 'a/sub', the sibling 'ab/x', and 'c'."""
+    ids = {}
+    for key, path in (("a", "a"), ("sub", "a/sub"), ("ab", "ab/x"), ("c", "c")):
+        payload = make_document(
+            title=f"Grant {key}", path=path, repo_name=f"grant-{key}",
+            content="grantterm",
+        )
+        ids[key] = client.post("/api/docs", json=payload).json()["id"]
+
+    links = {"a": "[[grant-sub]] [[grant-ab]]", "sub": "[[grant-a]]",
+             "ab": "[[grant-a]]", "c": "[[grant-a]]"}
+    for key, content in links.items():
+        client.put(f"/api/docs/{ids[key]}", json={
+            "content": f"grantterm {content}", "author_type": "human",
+        })
+    return ids
+
+
+class TestGrantScopedReads:
+
+    def test_list_is_scoped_and_nested_grants_collapse(self, client, docs):
+        _restrict(("a", "viewer"), ("a/sub", "editor"))
+        listed = {d["id"] for d in client.get("/api/docs").json()}
+        assert listed == {docs["a"], docs["sub"]}
+
+    def test_sibling_prefix_does_not_leak(self, client, docs):
+        _restrict(("a", "viewer"))
+        listed = {d["id"] for d in client.get("/api/docs").json()}
+        assert docs["ab"] not in listed
+        assert listed == {docs["a"], docs["sub"]}
+
+    def test_root_grant_sees_everything(self, client, docs):
+        _restrict(("", "viewer"), ("a", "editor"))
+        listed = {d["id"] for d in client.get("/api/docs", params={"limit": 500}).json()}
+        # Seed documents loaded at startup are visible too
+        assert set(docs.values()) <= listed
+
+    def test_no_grants_sees_nothing(self, client, docs):
+        _restrict()
+        assert client.get("/api/docs").json() == []
+        assert client.get("/api/tree").json() == []
+        assert client.get("/api/dependencies").json() == []
+
+    def test_tree_is_scoped(self, client, docs):
+        _restrict(("a", "viewer"), ("a/sub", "editor"))
+        tree = client.get("/api/tree").json()
+        assert [node["name"] for node in tree] == ["a"]
+        assert _tree_doc_ids(tree) == {docs["a"], docs["sub"]}
+
+    def test_dependency_graph_is_scoped(self, client, docs):
+        _restrict(("a", "viewer"), ("a/sub", "editor"))
+        pairs = {(d["from_doc_id"], d["to_doc_id"]) for d in client.get("/api/dependencies").json()}
+        assert pairs == {(docs["a"], docs["sub"]), (docs["sub"], docs["a"])}
+
+    def test_document_dependencies_are_scoped(self, client, docs):
+        _restrict(("a", "viewer"))
+        deps = client.get(f"/api/docs/{docs['a']}/dependencies").json()
+        assert {d["to_doc_id"] for d in deps["outgoing"]} == {docs["sub"]}
+        assert {d["from_doc_id"] for d in deps["incoming"]} == {docs["sub"]}
+
+    def test_search_is_scoped(self, client, docs):
+        _restrict(("a", "viewer"), ("a/sub", "editor"))
+        results = client.get("/api/docs/search/", params={"q": "grantterm"}).json()
+        assert {r["id"] for r in results} == {docs["a"], docs["sub"]}
+
+        _restrict(("", "viewer"))
+        results = client.get("/api/docs/search/", params={"q": "grantterm"}).json()
+        assert set(docs.values()) <= {r["id"] for r in results}
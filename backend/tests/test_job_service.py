@@ -0,0 +1,82 @@
+"""Unit tests for JobService — claim, complete, and the retry-or-fail decision."""
+
+import pytest
+from unittest.mock import patch
+
+from app.services.job_service import JobService
+
+
+@pytest.fixture()
+def service(db) -> JobService:
+    return JobService(db)
+
+
+def _running_job(service: JobService):
+    service.enqueue("https://github.com/org/repo", commit_sha="a" * 40)
+    return service.claim_next()
+
+
+class TestClaimAndComplete:
+
+    def test_claim_next_marks_running(self, service):
+        job = _running_job(service)
+        assert job.status == "running"
+        assert job.started_at is not None
+        assert service.claim_next() is None
+
+    def test_complete(self, service, db):
+        job = _running_job(service)
+        done = service.complete(job.id)
+        assert done.status == "completed"
+        assert done.completed_at is not None
+
+        db.expire_all()
+        assert service.get_job(job.id).status == "completed"
+
+    def test_complete_unknown_job_raises(self, service):
+        with pytest.raises(ValueError):
+            service.complete("no-such-job")
+
+
+class TestFail:
+
+    def test_first_failure_requeues(self, service, db):
+        job = _running_job(service)
+        failed = service.fail(job.id, "boom")
+        assert failed.status == "queued"
+        assert failed.retry_count == 1
+        assert failed.error_message == "[retry 1] boom"
+        assert failed.completed_at is None
+
+        db.expire_all()
+        assert service.claim_next().id == job.id
+
+    def test_retries_exhausted_marks_failed(self, service, db):
+        job = _running_job(service)
+        service.fail(job.id, "boom")
+        failed = service.fail(job.id, "boom again")
+        assert failed.status == "failed"
+        assert failed.retry_count == 2
+        assert failed.error_message == "boom again"
+        assert failed.completed_at is not None
+
+        db.expire_all()
+        stored = service.get_job(job.id)
+        assert stored.status == "failed"
+        assert service.claim_next() is None
+
+    def test_retry_log_appends(self, service):
+        job = _running_job(service)
+        with patch("app.services.job_service.MAX_RETRIES", 2):
+            service.fail(job.id, "first")
+            retried = service.fail(job.id, "second")
+            assert retried.status == "queued"
+            assert retried.error_message == "[retry 1] first\n[retry 2] second"
+
+            failed = service.fail(job.id, "third")
+            assert failed.status == "failed"
+            assert failed.retry_count == 3
+
+    def test_fail_unknown_job_raises(self, service):
+        with pytest.raises(ValueError):
+            service.fail("no-such-job", "boom")
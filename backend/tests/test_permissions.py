@@ -0,0 +1,82 @@
+"""Tests for the permission service — role resolution over folder grants."""
+
+from app.models.user import FolderGrant
+from app.services.permission_service import (
+    check_permission,
+    compile_grants,
+    filter_paths_by_grants,
+    resolve_role,
+)
+
+
+def _grants(*pairs: tuple[str, str]) -> list[FolderGrant]:
+    return [FolderGrant(path_prefix=prefix, role=role) for prefix, role in pairs]
+
+
+class TestResolveRole:
+
+    def test_longest_prefix_wins(self):
+        grants = _grants(("docs", "viewer"), ("docs/team", "editor"))
+        assert resolve_role(grants, "docs/team/guide") == "editor"
+        assert resolve_role(grants, "docs/other/guide") == "viewer"
+        assert resolve_role(grants, "docs") == "viewer"
+
+    def test_root_grant_matches_everything_but_loses_to_specific(self):
+        grants = _grants(("", "viewer"), ("private", "admin"))
+        assert resolve_role(grants, "anything/at/all") == "viewer"
+        assert resolve_role(grants, "") == "viewer"
+        assert resolve_role(grants, "private/notes") == "admin"
+
+    def test_no_matching_grant(self):
+        grants = _grants(("docs", "admin"))
+        assert resolve_role(grants, "other/doc") is None
+        assert resolve_role([], "docs/doc") is None
+
+    def test_duplicate_prefix_first_grant_wins(self):
+        grants = _grants(("docs", "viewer"), ("/docs/", "admin"))
+        assert resolve_role(grants, "docs/guide") == "viewer"
+        grants = _grants(("", "editor"), ("/", "viewer"))
+        assert resolve_role(grants, "docs/guide") == "editor"
+
+    def test_slash_padded_prefixes_and_paths_are_normalized(self):
+        grants = _grants(("/docs/team/", "editor"))
+        assert resolve_role(grants, "docs/team/guide") == "editor"
+        assert resolve_role(grants, "/docs/team/guide/") == "editor"
+
+    def test_sibling_prefix_does_not_match(self):
+        grants = _grants(("docs", "admin"))
+        assert resolve_role(grants, "docs2/x") is None
+        assert resolve_role(grants, "docsx") is None
+
+
+class TestCompiledGrants:
+
+    def test_compiled_dict_is_passed_through(self):
+        compiled = compile_grants(_grants(("docs", "viewer"), ("docs/team", "editor")))
+        assert compile_grants(compiled) is compiled
+        assert resolve_role(compiled, "docs/team/guide") == "editor"
+
+    def test_check_permission_accepts_list_and_compiled(self):
+        grants = _grants(("", "viewer"), ("docs", "editor"))
+        compiled = compile_grants(grants)
+        for g in (grants, compiled):
+            assert check_permission(g, "docs/guide", "edit")
+            assert not check_permission(g, "docs/guide", "admin")
+            assert check_permission(g, "other/guide", "read")
+            assert not check_permission(g, "other/guide", "edit")
+
+
+class TestFilterPathsByGrants:
+
+    def test_nested_and_duplicate_prefixes_collapse(self):
+        grants = _grants(("a/sub", "editor"), ("a", "viewer"), ("/a/", "admin"), ("b", "viewer"))
+        assert filter_paths_by_grants(grants) == ["a", "b"]
+
+    def test_sibling_prefix_is_kept(self):
+        assert filter_paths_by_grants(_grants(("a", "viewer"), ("ab/x", "viewer"))) == ["a", "ab/x"]
+
+    def test_root_grant_means_everything(self):
+        assert filter_paths_by_grants(_grants(("a", "viewer"), ("/", "viewer"))) == [""]
+
+    def test_no_grants(self):
+        assert filter_paths_by_grants([]) == []
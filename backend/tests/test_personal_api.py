@@ -0,0 +1,90 @@
+"""Tests for the personal tree — folders, document refs, and tree assembly."""
+
+import pytest
+
+from app.models.user import User
+from app.repositories.personal_tree_repository import PersonalTreeRepository
+from tests.conftest import make_document
+
+
+@pytest.fixture(autouse=True)
+def _anonymous_user(db):
+    """Personal rows reference users; auth-disabled requests run as 'anonymous'."""
+    db.merge(User(user_id="anonymous", display_name="Anonymous"))
+    db.commit()
+
+
+def _folder(client, name: str, parent_id: str | None = None) -> str:
+    resp = client.post("/api/personal/folders", json={"name": name, "parent_id": parent_id})
+    assert resp.status_code == 201
+    return resp.json()["folder_id"]
+
+
+class TestPersonalFolderMove:
+
+    def test_move_into_own_descendant_rejected(self, client):
+        top = _folder(client, "Top")
+        mid = _folder(client, "Mid", top)
+        leaf = _folder(client, "Leaf", mid)
+
+        for target in (top, mid, leaf):
+            resp = client.put(f"/api/personal/folders/{top}/move", json={"parent_id": target})
+            assert resp.status_code == 400
+
+    def test_move_under_unrelated_folder_allowed(self, client):
+        top = _folder(client, "Top")
+        mid = _folder(client, "Mid", top)
+        other = _folder(client, "Other")
+
+        resp = client.put(f"/api/personal/folders/{mid}/move", json={"parent_id": other})
+        assert resp.status_code == 200
+        assert resp.json()["parent_id"] == other
+
+        # The old parent is no longer an ancestor, so it can now move under mid
+        resp = client.put(f"/api/personal/folders/{top}/move", json={"parent_id": mid})
+        assert resp.status_code == 200
+
+
+class TestPersonalTree:
+
+    def test_tree_order_titles_and_orphans(self, client, db):
+        live = client.post("/api/docs", json=make_document(title="Live Doc", path="crate/p1")).json()["id"]
+        gone = client.post("/api/docs", json=make_document(title="Gone Doc", path="crate/p2")).json()["id"]
+
+        a = _folder(client, "A")
+        b = _folder(client, "B")
+        z = _folder(client, "Z")
+        sub = _folder(client, "Sub", a)
+        live_ref = client.post(f"/api/personal/folders/{a}/refs", json={"document_id": live}).json()["ref_id"]
+        gone_ref = client.post(f"/api/personal/folders/{a}/refs", json={"document_id": gone}).json()["ref_id"]
+        assert client.delete(f"/api/docs/{gone}").status_code == 204
+
+        # Display order: sort_order first, then name; Z is pinned to the top.
+        # Refs sort after subfolders regardless of their own sort_order.
+        repo = PersonalTreeRepository(db)
+        repo.get_folder(z).sort_order = -1
+        repo.get_ref(live_ref).sort_order = 2
+        repo.get_ref(gone_ref).sort_order = -5
+
+        # A folder hanging under another user's folder is unreachable
+        db.merge(User(user_id="other", display_name="Other"))
+        db.flush()
+        foreign = repo.create_folder("other", "Foreign")
+        repo.create_folder("anonymous", "Orphan", parent_id=foreign.folder_id)
+        db.commit()
+
+        def shape(nodes):
+            return [(n["type"], n["name"], n["id"], shape(n["children"])) for n in nodes]
+
+        tree = client.get("/api/personal/tree").json()
+        assert shape(tree) == [
+            ("folder", "Z", z, []),
+            ("folder", "A", a, [
+                ("folder", "Sub", sub, []),
+                ("document", gone, gone_ref, []),
+                ("document", "Live Doc", live_ref, []),
+            ]),
+            ("folder", "B", b, []),
+        ]
+        ref = tree[1]["children"][2]
+        assert (ref["document_id"], ref["ref_id"]) == (live, live_ref)